@@ -1,17 +1,73 @@
-import random
+import math
 
-from .constants import GENOME_LENGTH
-
-# Agent is created with random genome
+# Agent: lightweight view onto one row of a Population.
+# Agent() or Agent(genome=...) creates a standalone one-row population with a random or given genome.
 class Agent:
-    def __init__(self, genome=None):
-        if genome is None:
-            self.genome = [random.randint(0, 3) for _ in range(GENOME_LENGTH)]
-        else:
-            self.genome = genome
-        self.fitness = None
-        self.items_collected = 0
-        self.total_movement_cost = 0
-        self.positions_visited = set()
-        self.position_visit_counts = {}
-        self.actions_taken = 0  # For potential future use
\ No newline at end of file
+    __slots__ = ('population', 'index')
+
+    def __init__(self, genome=None, population=None, index=0):
+        if population is None:
+            from .population import Population  # population.py imports this module
+            if genome is None:
+                population = Population.random(1)
+            else:
+                population = Population([genome])
+        self.population = population
+        self.index = index
+
+    @property
+    def genome(self):
+        return self.population.genomes[self.index]
+
+    @genome.setter
+    def genome(self, genome):
+        self.population.genomes[self.index] = genome
+
+    @property
+    def fitness(self):
+        fitness = self.population.fitness[self.index]
+        return None if math.isnan(fitness) else float(fitness)
+
+    @fitness.setter
+    def fitness(self, fitness):
+        self.population.fitness[self.index] = math.nan if fitness is None else fitness
+
+    @property
+    def items_collected(self):
+        return int(self.population.items_collected[self.index])
+
+    @items_collected.setter
+    def items_collected(self, items_collected):
+        self.population.items_collected[self.index] = items_collected
+
+    @property
+    def total_movement_cost(self):
+        return int(self.population.total_movement_cost[self.index])
+
+    @total_movement_cost.setter
+    def total_movement_cost(self, total_movement_cost):
+        self.population.total_movement_cost[self.index] = total_movement_cost
+
+    @property
+    def unique_positions(self):
+        return int(self.population.unique_positions[self.index])
+
+    @unique_positions.setter
+    def unique_positions(self, unique_positions):
+        self.population.unique_positions[self.index] = unique_positions
+
+    @property
+    def revisits(self):
+        return int(self.population.revisits[self.index])
+
+    @revisits.setter
+    def revisits(self, revisits):
+        self.population.revisits[self.index] = revisits
+
+    @property
+    def effective_length(self):
+        return int(self.population.effective_length[self.index])
+
+    @effective_length.setter
+    def effective_length(self, effective_length):
+        self.population.effective_length[self.index] = effective_length
@@ -0,0 +1,136 @@
+import numpy as np
+
+# Batch Simulation: steps every genome of the population forward together with NumPy ops.
+# Mirrors GameSimulation.simulate/calculate_fitness exactly, one gene column at a time.
+# Given a list of same-sized maps, every genome is played on every map in the same pass
+# (one row per (map, agent) pair) and results come back with shape (maps, agents).
+class BatchSimulation:
+    def __init__(self, grid_map):
+        self.multi_map = isinstance(grid_map, (list, tuple))
+        grid_maps = list(grid_map) if self.multi_map else [grid_map]
+        self.grid_map = grid_maps[0]
+        self.grid_maps = grid_maps
+        num_cells = self.grid_map.num_cells
+        if any(other.num_cells != num_cells for other in grid_maps):
+            raise ValueError("All maps of a batch simulation must have the same dimensions.")
+
+        # Tables of all maps stacked; map m owns the global cells m * num_cells .. (m + 1) * num_cells - 1
+        offsets = np.arange(len(grid_maps)) * num_cells
+        self.map_offsets = offsets
+        self.start_cells = np.array([other.start_cell for other in grid_maps]) + offsets
+        self.transition_array = np.concatenate([
+            np.where(other.transition_array >= 0, other.transition_array + offset, -1)
+            for other, offset in zip(grid_maps, offsets)
+        ])
+        self.cost_array = np.concatenate([other.cost_array for other in grid_maps])
+        self.item_slot = np.concatenate([other.item_slot for other in grid_maps])
+        self.neighbour_array = np.concatenate([other.neighbour_array for other in grid_maps])  # Local cells
+        self.num_items = np.array([len(other.item_cells) for other in grid_maps])
+        max_items = self.num_items.max()
+        self.item_rewards = np.zeros((len(grid_maps), max_items), dtype=np.int64)
+        self.item_positive = np.zeros((len(grid_maps), max_items), dtype=np.int64)
+        for index, other in enumerate(grid_maps):
+            self.item_rewards[index, :len(other.item_cells)] = other.item_rewards
+            self.item_positive[index, :len(other.item_cells)] = other.item_positive
+
+    def simulate(self, genomes):
+        genomes = np.asarray(genomes)
+        population_size, genome_length = genomes.shape
+        num_maps = len(self.grid_maps)
+        num_cells = self.grid_map.num_cells
+        num_rows = num_maps * population_size
+        rows = np.arange(num_rows)
+        map_of = rows // population_size  # Row r plays genome r % population_size on map r // population_size
+        agent_of = rows % population_size
+        offset_of = self.map_offsets[map_of]
+        self.steps_played = 0  # Genes actually played, summed over agents (and maps)
+
+        # Per-row game state
+        cell = self.start_cells[map_of].astype(np.int64)
+        score = np.full(num_rows, 100, dtype=np.int64)
+        total_movement_cost = np.zeros(num_rows, dtype=np.int64)
+        items_collected = np.zeros(num_rows, dtype=np.int64)
+        items_left = np.arange(self.item_rewards.shape[1]) < self.num_items[map_of, None]
+        items_remaining = self.num_items[map_of].astype(np.int64)
+        game_won = np.zeros(num_rows, dtype=bool)
+
+        # Boolean boards, one byte per tile; the extra last column is the always-visible padding
+        # sentinel of neighbour_array, so reveals and counts stay proportional to the 9 neighbours
+        visible = np.zeros((num_rows, num_cells + 1), dtype=bool)
+        visible[:, num_cells] = True
+        visible[rows[:, None], self.neighbour_array[cell]] = True
+        visible_count = visible.sum(axis=1) - 1
+        visited = np.zeros((num_rows, num_cells), dtype=bool)
+        visited[rows, cell - offset_of] = True
+        moves = np.zeros(num_rows, dtype=np.int64)
+        genes_played = np.zeros(num_rows, dtype=np.int64)
+
+        for step in range(genome_length):
+            # Early termination: agents that are out of score or have won stop moving
+            active = rows[(score > 0) & ~game_won]
+            if active.size == 0:
+                break
+            self.steps_played += active.size
+            genes_played[active] += 1
+
+            # Moves through the transition table, -1 means the move leaves the grid
+            new_cells = self.transition_array[cell[active], genomes[agent_of[active], step]]
+            in_bounds = new_cells >= 0
+            moved = active[in_bounds]
+            new_cells = new_cells[in_bounds]
+
+            # Pays the terrain cost and moves
+            costs = self.cost_array[new_cells]
+            score[moved] -= costs
+            total_movement_cost[moved] += costs
+            cell[moved] = new_cells
+
+            # Picks up items
+            slots = self.item_slot[new_cells]
+            on_item = slots >= 0
+            if on_item.any():
+                picked = np.zeros(len(moved), dtype=bool)
+                picked[on_item] = items_left[moved[on_item], slots[on_item]]
+                picked_agents = moved[picked]
+                picked_slots = slots[picked]
+                picked_maps = map_of[picked_agents]
+                items_left[picked_agents, picked_slots] = False
+                items_remaining[picked_agents] -= 1
+                score[picked_agents] += self.item_rewards[picked_maps, picked_slots]
+                items_collected[picked_agents] += self.item_positive[picked_maps, picked_slots]
+
+            np.maximum(score, 0, out=score)
+            moves[moved] += 1
+
+            # First visits reveal the 3x3 neighbourhood; revisited tiles have revealed theirs already
+            local_cells = new_cells - offset_of[moved]
+            first_visit = ~visited[moved, local_cells]
+            if first_visit.any():
+                explorers = moved[first_visit]
+                visited[explorers, local_cells[first_visit]] = True
+                neighbourhoods = self.neighbour_array[new_cells[first_visit]]
+                visible_count[explorers] += (~visible[explorers[:, None], neighbourhoods]).sum(axis=1)
+                visible[explorers[:, None], neighbourhoods] = True
+
+            # Win check runs for every active agent, even if its move was blocked
+            game_won[active] = (items_remaining[active] == 0) & (visible_count[active] == num_cells)
+
+        unique_positions = visited.sum(axis=1)
+        revisits = moves + 1 - unique_positions  # Starting tile plus one visit per move
+        uncollected_items = 5 - items_collected  # Assumes 5 items, same as calculate_fitness
+
+        # Same term order as GameSimulation.calculate_fitness so float results match exactly
+        fitness = (
+            (items_collected * 300)
+            - (total_movement_cost * 2)
+            + (score * 1.5)
+            - (uncollected_items * 150)
+            + (unique_positions * 15)
+            - (revisits * 10)
+        )
+
+        # Results in Population.STATS order, (maps, agents) arrays when simulating several maps
+        results = (fitness, items_collected, total_movement_cost, unique_positions, revisits, genes_played)
+        if self.multi_map:
+            return tuple(values.reshape(num_maps, population_size) for values in results)
+        return results
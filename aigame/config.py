@@ -0,0 +1,104 @@
+import dataclasses
+import hashlib
+import json
+from dataclasses import dataclass
+
+from . import constants
+
+# Run Configuration: every tuning knob of a run in one object, threaded through genetic_algorithm(),
+# selection, reproduction and the evaluation modes. Defaults come from aigame/constants.py, so
+# editing the constants still changes the default run; two configurations can coexist in one process.
+@dataclass(frozen=True)
+class GAConfig:
+    # Genetic algorithm
+    genome_length: int = None  # None: GENES_PER_TILE per board tile (GENOME_LENGTH on the default board)
+    population_size: int = constants.POPULATION_SIZE
+    generations: int = constants.GENERATIONS
+    initial_mutation_rate: float = constants.INITIAL_MUTATION_RATE
+    min_mutation_rate: float = constants.MIN_MUTATION_RATE
+    elite_size: int = constants.ELITE_SIZE
+    immigration_rate: float = constants.IMMIGRATION_RATE
+    stagnation_threshold: int = constants.STAGNATION_THRESHOLD
+    tournament_size_min: int = constants.TOURNAMENT_SIZE_MIN
+    tournament_size_max: int = constants.TOURNAMENT_SIZE_MAX
+    selection_method: str = constants.SELECTION_METHOD
+    reproduction_mode: str = constants.REPRODUCTION_MODE
+    ga_mode: str = constants.GA_MODE
+    steady_state_batch: int = constants.STEADY_STATE_BATCH
+    mutation_region: str = constants.MUTATION_REGION
+    dead_gene_skipping: bool = constants.DEAD_GENE_SKIPPING
+    initialization: str = constants.INITIALIZATION
+    heuristic_seed_fraction: float = constants.HEURISTIC_SEED_FRACTION
+    heuristic_pool_size: int = constants.HEURISTIC_POOL_SIZE
+    memetic_budget: float = constants.MEMETIC_BUDGET
+    run_seed: int = None  # Seeds the run's random streams, None draws fresh entropy
+
+    # Map
+    map_seed: int = 42  # Fixed seed for consistent terrain and items
+    grid_width: int = constants.GRID_WIDTH
+    grid_height: int = constants.GRID_HEIGHT
+
+    # Fitness evaluation
+    evaluation_backend: str = constants.EVALUATION_BACKEND
+    evaluation_workers: int = constants.EVALUATION_WORKERS
+    checkpoint_interval: int = constants.CHECKPOINT_INTERVAL
+    fitness_cache_size: int = constants.FITNESS_CACHE_SIZE
+    robust_map_count: int = constants.ROBUST_MAP_COUNT
+    robust_aggregate: str = constants.ROBUST_AGGREGATE
+    robust_quantile: float = constants.ROBUST_QUANTILE
+
+    # Island model
+    island_count: int = constants.ISLAND_COUNT
+    migration_interval: int = constants.MIGRATION_INTERVAL
+    migration_size: int = constants.MIGRATION_SIZE
+    migration_topology: str = constants.MIGRATION_TOPOLOGY
+
+    # Early stopping
+    early_stop_gap: float = constants.EARLY_STOP_GAP
+    plateau_window: int = constants.PLATEAU_WINDOW
+    plateau_min_improvement: float = constants.PLATEAU_MIN_IMPROVEMENT
+
+    # Hall of fame (the archive's content changes what a warm start begins from)
+    archive_path: str = constants.ARCHIVE_PATH
+    warm_start: int = constants.WARM_START
+
+    # Outputs: where files go, none of these change the evolved result
+    output_dir: str = '.'
+    metrics_path: str = constants.METRICS_PATH
+    profile_generations: tuple = constants.PROFILE_GENERATIONS
+    run_checkpoint_dir: str = constants.RUN_CHECKPOINT_DIR
+    run_checkpoint_every: int = constants.RUN_CHECKPOINT_EVERY
+    replay_export_dir: str = constants.REPLAY_EXPORT_DIR
+    replay_export_every: int = constants.REPLAY_EXPORT_EVERY
+    archive_size: int = constants.ARCHIVE_SIZE
+    telemetry_port: int = constants.TELEMETRY_PORT
+    telemetry_queue_size: int = constants.TELEMETRY_QUEUE_SIZE
+    log_interval: int = constants.LOG_INTERVAL
+
+    def __post_init__(self):
+        if self.genome_length is None:
+            object.__setattr__(self, 'genome_length', self.scaled_genome_length())
+
+    def scaled_genome_length(self):
+        return constants.GENES_PER_TILE * self.grid_width * self.grid_height
+
+    # Copy with some fields changed; unknown names raise TypeError. A genome length that scales with
+    # the board keeps scaling when the grid size changes.
+    def replace(self, **changes):
+        if 'genome_length' not in changes and self.genome_length == self.scaled_genome_length():
+            changes['genome_length'] = None
+        return dataclasses.replace(self, **changes)
+
+    def to_dict(self):
+        return dataclasses.asdict(self)
+
+    # Stable digest of the fields that affect the evolved result (used to cache sweep runs)
+    def result_key(self):
+        fields = {name: value for name, value in self.to_dict().items() if name not in OUTPUT_FIELDS}
+        return hashlib.blake2b(json.dumps(fields, sort_keys=True).encode(), digest_size=12).hexdigest()
+
+OUTPUT_FIELDS = ('output_dir', 'metrics_path', 'profile_generations', 'run_checkpoint_dir',
+                 'run_checkpoint_every', 'replay_export_dir', 'replay_export_every', 'evaluation_workers', 'archive_size',
+                 'telemetry_port', 'telemetry_queue_size', 'log_interval')
+
+DEFAULT_CONFIG = GAConfig()
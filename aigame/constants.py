@@ -1,6 +1,9 @@
 # Genetic Algorithm Constants
 
-GENOME_LENGTH = 500  # Increased from 200 to allow more actions
+GRID_WIDTH = 10  # Map size in tiles; 100x100 and 256x256 boards are supported
+GRID_HEIGHT = 10
+GENES_PER_TILE = 5  # Genome length per board tile when GAConfig.genome_length is not set
+GENOME_LENGTH = GENES_PER_TILE * GRID_WIDTH * GRID_HEIGHT  # Increased from 200 to allow more actions (500 on 10x10), scales with the board area
 POPULATION_SIZE = 1000 # 1000 for optimal
 GENERATIONS = 110  # Increased from 50 to allow more evolution / 100 for optimal
 INITIAL_MUTATION_RATE = 0.05  # Higher initial mutation rate 0.1 for optimal or .2
@@ -17,6 +20,55 @@ TOURNAMENT_SIZE_MAX = 70  # Max size for tournament selection
 
 # Selection Mechanism Options
 SELECTION_METHOD = 'adaptive_tournament'  # Options: 'adaptive_tournament', 'rank_based'
+REPRODUCTION_MODE = 'batch'  # Options: 'batch' (whole brood with NumPy), 'per_child' (one child at a time)
+GA_MODE = 'generational'  # Options: 'generational' (evaluate, then reproduce the whole population), 'steady_state' (asynchronous evaluator pool, no generation barrier)
+STEADY_STATE_BATCH = 16  # Children per evaluation task in the 'steady_state' mode
+MUTATION_REGION = 'genome'  # Options: 'genome' (every gene), 'live' (only genes the parent executed before its game ended)
+DEAD_GENE_SKIPPING = True  # Children whose changes all fall after the parent's game ended inherit its stats unsimulated
+INITIALIZATION = 'random'  # Options: 'random', 'heuristic' (part of the population and immigrants seeded from shortest-path item tours)
+HEURISTIC_SEED_FRACTION = 0.2  # Fraction of the initial population and of each generation's immigrants that is seeded
+HEURISTIC_POOL_SIZE = 32  # Tour variants built once per run; seeded genomes are mutated copies of them
+MEMETIC_BUDGET = 0.0  # Genes simulated per generation hill-climbing the ELITE_SIZE elites, as a fraction of the genes the generation's evaluation played, 0 disables
+
+# Fitness Evaluation Options
+EVALUATION_BACKEND = 'serial'  # Options: 'serial' (GameSimulation per agent), 'batch' (NumPy whole population), 'parallel' (process pool), 'prefix' (shared genome prefixes simulated once)
+EVALUATION_WORKERS = None  # Process count for the 'parallel' backend, None uses every CPU core
+CHECKPOINT_INTERVAL = 0  # Genes between simulation snapshots children resume from ('serial' backend), 0 disables; e.g. 10 trades memory for replayed genes
+FITNESS_CACHE_SIZE = 5000  # Max genomes kept in the LRU fitness cache, 0 disables caching
+ROBUST_MAP_COUNT = 1  # Maps (seeds 42, 43, ...) every genome is scored on in one batched pass, 1 uses the seed-42 map only
+ROBUST_AGGREGATE = 'mean'  # Options: 'mean', 'min', 'quantile' (combines a genome's fitness over the maps)
+ROBUST_QUANTILE = 0.25  # Quantile used by the 'quantile' aggregate
+
+# Instrumentation Options
+METRICS_PATH = None  # JSONL file (relative to the output directory) for per-generation phase timings and counters, None disables
+PROFILE_GENERATIONS = None  # Inclusive (first, last) generation range to run under cProfile, e.g. (10, 12); saved as profile_generations.prof in the output directory
+REPLAY_EXPORT_DIR = None  # Directory for animated replays of each generation's best agent (no display needed), None disables
+REPLAY_EXPORT_EVERY = 1  # Generations between exported replays
+
+# Hall of Fame Options
+ARCHIVE_PATH = None  # SQLite archive of elite genomes shared by runs (e.g. 'hall_of_fame.sqlite'), None disables
+ARCHIVE_SIZE = 20  # Top agents of each finished run added to the archive
+WARM_START = 0  # Archived genomes (best first, same map before similar maps) placed in the initial population
+
+# Live Telemetry Options
+TELEMETRY_PORT = None  # Local HTTP port serving live metrics, the best genome and its replay trace (0 picks a free port), None disables
+TELEMETRY_QUEUE_SIZE = 64  # Pending updates between the GA loop and the telemetry thread; the oldest is dropped when full
+LOG_INTERVAL = 1  # Generations between printed generation lines (metrics and telemetry still cover every generation)
+
+# Run Checkpoint Options
+RUN_CHECKPOINT_DIR = None  # Directory for crash-safe run checkpoints, None disables
+RUN_CHECKPOINT_EVERY = 10  # Generations between run checkpoints
+
+# Island Model Options
+ISLAND_COUNT = 1  # Subpopulations evolved in separate processes, 1 runs the single-population GA
+MIGRATION_INTERVAL = 10  # Generations between migrations
+MIGRATION_SIZE = 5  # Top agents each island sends per migration
+MIGRATION_TOPOLOGY = 'ring'  # Options: 'ring' (to the next island), 'full' (to every other island)
+
+# Early Stopping Options
+EARLY_STOP_GAP = 0.0  # Stop once the best fitness is within this fraction of the map's fitness upper bound (0.0 = reached it), None disables
+PLATEAU_WINDOW = 40  # Generations over which improvement is measured, 0 disables plateau stopping
+PLATEAU_MIN_IMPROVEMENT = 0.1  # Stop when the best fitness improved by less than this per generation over PLATEAU_WINDOW
 
 
 # Movement Actions
@@ -0,0 +1,199 @@
+import os
+import multiprocessing
+import numpy as np
+
+from .population import Population
+from .game_simulation import GameSimulation, SnapshotCodec
+from .batch_simulation import BatchSimulation
+from .prefix_simulation import PrefixSimulation
+from .fitness_cache import FitnessCache, genome_digest
+
+# Parallel worker state: each pool process receives the map once at start-up
+_worker_game = None
+
+def _init_worker(grid_map):
+    global _worker_game
+    _worker_game = GameSimulation(grid_map=grid_map)
+
+# Simulates a chunk of genomes (uint8 matrix) and returns compact result tuples plus the genes played
+def _evaluate_chunk(genomes):
+    chunk = Population(genomes)
+    steps_played = 0
+    for agent in chunk:
+        _worker_game.simulate(agent)
+        steps_played += _worker_game.steps_played
+    return [chunk.get_stats(i) for i in range(len(chunk))], steps_played
+
+# Robust fitness: combines per-map fitness (maps x agents) into one score per agent
+def aggregate_fitness(fitness, aggregate='mean', quantile=0.25):
+    if aggregate == 'mean':
+        return fitness.mean(axis=0)
+    if aggregate == 'min':
+        return fitness.min(axis=0)
+    if aggregate == 'quantile':
+        return np.quantile(fitness, quantile, axis=0)
+    raise ValueError("Invalid ROBUST_AGGREGATE. Choose 'mean', 'min' or 'quantile'.")
+
+# Population Evaluator: runs fitness evaluation for a whole generation on the chosen backend
+class PopulationEvaluator:
+    def __init__(self, grid_map, backend='serial', cache_size=0, workers=None, checkpoint_interval=0,
+                 robust_maps=None, aggregate='mean', quantile=0.25):
+        if backend not in ('serial', 'batch', 'parallel', 'prefix'):
+            raise ValueError("Invalid EVALUATION_BACKEND. Choose 'serial', 'batch', 'parallel' or 'prefix'.")
+        self.grid_map = grid_map
+        # Robust fitness over several maps always runs as one batched (maps x agents) pass
+        self.robust_sim = None
+        self.map_count = 1
+        if robust_maps is not None and len(robust_maps) > 1:
+            aggregate_fitness(np.zeros((1, 1)), aggregate, quantile)  # Validates the aggregate up front
+            self.robust_sim = BatchSimulation(list(robust_maps))
+            self.map_count = len(robust_maps)
+            backend = 'batch'
+        self.aggregate = aggregate
+        self.quantile = quantile
+        self.backend = backend
+        # Incremental evaluation (serial backend): children resume from their parent's snapshots
+        self.checkpoint_interval = checkpoint_interval if backend == 'serial' else 0
+        self.game_sim = GameSimulation(grid_map=grid_map)
+        self.snapshot_codec = SnapshotCodec(grid_map)
+        self.batch_sim = None
+        if backend == 'batch' and self.robust_sim is None:
+            self.batch_sim = BatchSimulation(grid_map)
+        self.prefix_sim = PrefixSimulation(grid_map) if backend == 'prefix' else None
+        self.cache = FitnessCache(cache_size) if cache_size > 0 else None
+        self.workers = workers or os.cpu_count() or 1
+        # Per-evaluate() step counters, reset by evaluate()
+        self.steps_resumed = 0
+        self.steps_played = 0
+        self.agents_simulated = 0
+        self.steps_deduplicated = 0
+        self.pool = None
+        self.pool_chunks = 0
+        if backend == 'parallel':
+            self.pool = multiprocessing.Pool(
+                self.workers, initializer=_init_worker, initargs=(grid_map,)
+            )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    # Parent snapshots still valid for a child: those taken before its first changed gene
+    # (packed records, see SnapshotCodec)
+    def inherited_checkpoints(self, population, index):
+        parent_checkpoints = population.parent_checkpoints[index]
+        if not parent_checkpoints or not self.checkpoint_interval:
+            return b''
+        return parent_checkpoints[:population.first_changed[index] // self.checkpoint_interval
+                                  * self.snapshot_codec.size]
+
+    # Evaluates every agent of the population and returns per-generation statistics
+    def evaluate(self, population):
+        stats = {}
+        self.steps_resumed = 0
+        self.steps_played = 0
+        self.agents_simulated = 0
+        self.steps_deduplicated = 0
+        self.pool_chunks = 0
+        # Dead-gene skipping: children that inherited their parent's stats in reproduce() are not simulated
+        candidates = np.flatnonzero(~population.stats_inherited)
+        if self.cache is None:
+            self.simulate(population, candidates)
+        else:
+            hits_before, misses_before = self.cache.hits, self.cache.misses
+
+            # Looks up each genome; duplicates within the generation are simulated once
+            pending = {}
+            for index in candidates.tolist():
+                key = genome_digest(population.genomes[index])
+                if key in pending:
+                    pending[key].append(index)
+                elif not self.cache.restore(key, population, index):
+                    pending[key] = [index]
+
+            self.simulate(population, np.array([rows[0] for rows in pending.values()], dtype=np.int64))
+            for key, rows in pending.items():
+                self.cache.store(key, population, rows[0])
+                for duplicate in rows[1:]:
+                    self.cache.restore(key, population, duplicate)
+
+            stats['cache_hits'] = self.cache.hits - hits_before
+            stats['cache_misses'] = self.cache.misses - misses_before
+
+        # Cached and skipped rows were not simulated but can still hand their prefix snapshots to children
+        if self.checkpoint_interval:
+            for index in range(len(population)):
+                if population.checkpoints[index] is None:
+                    population.checkpoints[index] = self.inherited_checkpoints(population, index)
+        stats['dead_gene_skips'] = len(population) - len(candidates)
+        # Genes of simulated agents were either played, resumed over, or cut off by early termination
+        stats['steps_executed'] = self.steps_played
+        stats['steps_terminated'] = (
+            self.agents_simulated * self.map_count * population.genome_length - self.steps_played
+            - self.steps_resumed - self.steps_deduplicated
+        )
+        if self.checkpoint_interval:
+            stats['steps_resumed'] = self.steps_resumed
+        if self.prefix_sim is not None:
+            # Shared prefixes count as deduplicated: played once for every genome that contains them
+            stats['steps_deduplicated'] = self.steps_deduplicated
+            equivalent = self.steps_played + self.steps_deduplicated
+            stats['dedup_fraction'] = self.steps_deduplicated / equivalent if equivalent else 0.0
+        if self.pool is not None:
+            stats['pool_workers'] = self.workers
+            stats['pool_chunks'] = self.pool_chunks
+        return stats
+
+    # Simulates the given rows of the population and writes their results back into it
+    def simulate(self, population, rows):
+        self.agents_simulated += len(rows)
+        if len(rows) == 0:
+            return
+        if self.backend == 'serial':
+            for index in rows:
+                if not self.checkpoint_interval:
+                    self.game_sim.simulate(population[index])
+                    self.steps_played += self.game_sim.steps_played
+                    continue
+                # Restarts from the parent's latest snapshot before the first changed gene
+                inherited = self.inherited_checkpoints(population, index)
+                resume_from = self.snapshot_codec.unpack(inherited, -1) if inherited else None
+                if resume_from is not None:
+                    self.steps_resumed += resume_from[0]
+                checkpoints = self.game_sim.simulate(population[index], self.checkpoint_interval, resume_from)
+                self.steps_played += self.game_sim.steps_played
+                population.checkpoints[index] = inherited + self.snapshot_codec.pack(checkpoints)
+            return
+
+        if self.backend == 'parallel':
+            # A few chunks per worker keeps the load balanced without per-agent task overhead
+            chunk_size = max(1, -(-len(rows) // (self.workers * 4)))
+            chunks = [population.genomes[rows[i:i + chunk_size]] for i in range(0, len(rows), chunk_size)]
+            results = []
+            for chunk_results, steps_played in self.pool.map(_evaluate_chunk, chunks):
+                results.extend(chunk_results)
+                self.steps_played += steps_played
+            self.pool_chunks = len(chunks)
+            population.set_stats(rows, zip(*results))
+            return
+
+        if self.backend == 'prefix':
+            self.prefix_sim.simulate(population, rows)
+            self.steps_played += self.prefix_sim.steps_played
+            self.steps_deduplicated += self.prefix_sim.steps_equivalent - self.prefix_sim.steps_played
+            return
+
+        if self.robust_sim is not None:
+            # Fitness is the aggregate over maps, the other stats are averaged over maps, and the
+            # effective length is the longest game: later genes are dead on every map
+            fitness, *map_stats, effective_length = self.robust_sim.simulate(population.genomes[rows])
+            population.set_stats(rows, [aggregate_fitness(fitness, self.aggregate, self.quantile)]
+                                 + [np.rint(values.mean(axis=0)) for values in map_stats]
+                                 + [effective_length.max(axis=0)])
+            self.steps_played += self.robust_sim.steps_played
+            return
+
+        population.set_stats(rows, self.batch_sim.simulate(population.genomes[rows]))
+        self.steps_played += self.batch_sim.steps_played
@@ -0,0 +1,86 @@
+import heapq
+
+from .game_simulation import GameSimulation
+
+# Fitness Upper Bound: no genome can score above this on the map.
+# A Dijkstra search over (cell, collected-items mask) gives the cheapest movement cost D(S) that
+# collects exactly the item set S. calculate_fitness() rewards items, remaining score and new
+# tiles and penalises movement cost and revisits, so a run that collects S and visits U new tiles
+# scores at most calculate_fitness() with:
+#   no revisits (every move enters a new tile, moves = U)
+#   movement cost C = max(D(S), cost of the U cheapest tiles), since both are lower bounds on C
+#   score = 100 + rewards(S) - C while alive, or 0 (and C >= 100 + rewards(S)) once it hits zero
+# Maximising over S and U gives the bound. It ignores the backtracking a real route needs to
+# reach every tile, so it is exact only on maps a route can sweep without revisits.
+
+# Cheapest movement cost from the start to every collected-items mask
+def collection_costs(grid_map):
+    best = {}
+    distances = {(grid_map.start_cell, 0): 0}
+    queue = [(0, grid_map.start_cell, 0)]
+    while queue:
+        cost, cell, mask = heapq.heappop(queue)
+        if cost > distances[(cell, mask)]:
+            continue
+        best.setdefault(mask, cost)  # Popped in cost order, so the first pop of a mask is its cheapest
+        for new_cell in grid_map.transitions[cell]:
+            if new_cell < 0:
+                continue
+            slot = grid_map.item_slots[new_cell]
+            new_mask = mask | (1 << slot) if slot >= 0 else mask  # Entering an item tile always picks it up
+            new_cost = cost + grid_map.costs[new_cell]
+            if new_cost < distances.get((new_cell, new_mask), float('inf')):
+                distances[(new_cell, new_mask)] = new_cost
+                heapq.heappush(queue, (new_cost, new_cell, new_mask))
+    return best
+
+def _fitness(game, items_collected, total_movement_cost, score, new_tiles):
+    game.items_collected = items_collected
+    game.total_movement_cost = total_movement_cost
+    game.score = score
+    game.unique_positions = new_tiles + 1
+    game.moves = new_tiles
+    return game.calculate_fitness()
+
+# Upper bound on the fitness of any genome_length-gene genome; returns (bound, route summary)
+def fitness_upper_bound(grid_map, genome_length):
+    game = GameSimulation(grid_map=grid_map)
+    start_score = game.score
+    tile_costs = sorted(grid_map.costs[cell] for cell in range(grid_map.num_cells) if cell != grid_map.start_cell)
+    tile_costs = tile_costs[:genome_length]  # Each move reaches at most one new tile
+    cheapest = [0]
+    for cost in tile_costs:
+        cheapest.append(cheapest[-1] + cost)
+
+    bound, route = float('-inf'), None
+    for mask, collection_cost in collection_costs(grid_map).items():
+        slots = [slot for slot in range(len(grid_map.item_cells)) if mask >> slot & 1]
+        rewards = sum(grid_map.item_reward_list[slot] for slot in slots)
+        items_collected = sum(1 for slot in slots if grid_map.item_reward_list[slot] > 0)
+        for new_tiles, exploration_cost in enumerate(cheapest):
+            cost = max(collection_cost, exploration_cost)
+            if cost < start_score + rewards:
+                fitness = _fitness(game, items_collected, cost, start_score + rewards - cost, new_tiles)
+            else:
+                fitness = _fitness(game, items_collected, max(cost, start_score + rewards), 0, new_tiles)
+            if fitness > bound:
+                bound = fitness
+                route = {'items_collected': items_collected, 'collection_cost': collection_cost,
+                         'new_tiles': new_tiles, 'movement_cost': cost}
+    return bound, route
+
+# Reason to stop a run early, or None: the best fitness is within `gap` (a fraction of |bound|)
+# of the upper bound, or it improved by less than `min_improvement` per generation over the
+# last `window` generations
+def early_stop_reason(best_fitness_history, bound=None, gap=None, window=0, min_improvement=0.0):
+    if not best_fitness_history:
+        return None
+    best = best_fitness_history[-1]
+    if bound is not None and gap is not None and best >= bound - gap * abs(bound):
+        return f"best fitness {best:.2f} is within {gap:.1%} of the upper bound {bound:.2f}"
+    if window and len(best_fitness_history) > window:
+        improvement = (best - best_fitness_history[-1 - window]) / window
+        if improvement < min_improvement:
+            return (f"best fitness improved by {improvement:.2f} per generation over the last {window} "
+                    f"generations (threshold {min_improvement})")
+    return None
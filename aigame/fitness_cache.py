@@ -0,0 +1,35 @@
+import hashlib
+from collections import OrderedDict
+
+# Fitness Cache: simulation is deterministic for a fixed seed/terrain/items,
+# so results can be reused for any genome that has been simulated before
+def genome_digest(genome):
+    return hashlib.blake2b(bytes(genome), digest_size=16).digest()
+
+class FitnessCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Restores cached results (Population.STATS order) onto a population row; returns False on a miss
+    def restore(self, key, population, index):
+        stats = self.entries.get(key)
+        if stats is None:
+            self.misses += 1
+            return False
+        self.entries.move_to_end(key)
+        self.hits += 1
+        population.set_stats(index, stats)
+        return True
+
+    def store(self, key, population, index):
+        self.entries[key] = population.get_stats(index)
+        self.entries.move_to_end(key)
+        # Evicts least recently used entries
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
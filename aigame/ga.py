@@ -1,36 +1,119 @@
 import copy
+import os
 import pickle
-import matplotlib.pyplot as plt
+import time
 import numpy as np
 
-from .constants import (
-    GENOME_LENGTH,
-    POPULATION_SIZE,
-    GENERATIONS,
-    INITIAL_MUTATION_RATE,
-    MIN_MUTATION_RATE,
-    ELITE_SIZE,
-    IMMIGRATION_RATE,
-    STAGNATION_THRESHOLD,
-    SELECTION_METHOD
-)
-from .agent import Agent
-from .game_simulation import GameSimulation
-from .selection import adaptive_tournament_selection, rank_based_selection
-from .operators import two_point_crossover, swap_mutation
-from .render import render_game
-
-def genetic_algorithm():
-    global INITIAL_MUTATION_RATE 
-
-    # Initialize population
-    population = [Agent() for _ in range(POPULATION_SIZE)]
-    seed = 42  # Fixed seed for consistent terrain and items
-
-    # Generate initial items and terrain
-    temp_game = GameSimulation(seed=seed)
-    initial_items = temp_game.initial_items
-    initial_terrain = temp_game.initial_terrain
+from .config import DEFAULT_CONFIG
+from .rng import RunRNG
+from .population import Population
+from .seeding import make_seeder, initial_population
+from .hall_of_fame import warm_start_genomes, archive_run
+from .local_search import LocalSearch, generation_budget
+from .telemetry import Telemetry
+from .grid_map import GridMap
+from .evaluation import PopulationEvaluator, aggregate_fitness
+from .fitness_bound import fitness_upper_bound, early_stop_reason
+from .reproduction import reproduce
+from .instrumentation import Instrumentation
+from .run_checkpoint import save_run_checkpoint, load_run_checkpoint
+from .islands import run_islands
+from .steady_state import run_steady_state
+from .trajectory import record_trajectory, export_animation
+
+# Runs one GA with the given GAConfig (DEFAULT_CONFIG if None); keyword overrides replace single
+# fields, e.g. genetic_algorithm(population_size=200, headless=True)
+def genetic_algorithm(config=None, headless=False, resume=False, **overrides):
+    config = (config or DEFAULT_CONFIG).replace(**overrides)
+    checkpoint_dir = config.run_checkpoint_dir
+    if resume and config.island_count > 1:
+        raise ValueError("The island model does not write run checkpoints to resume from; use ISLAND_COUNT = 1.")
+    if resume and config.ga_mode == 'steady_state':
+        raise ValueError("Steady-state mode does not write run checkpoints to resume from; use GA_MODE = 'generational'.")
+    # Latest run checkpoint to resume from (checked against this config's run shape and seed)
+    resumed = load_run_checkpoint(checkpoint_dir, config) if resume and checkpoint_dir else None
+    # Every random draw of the run comes from streams spawned from run_seed (fresh entropy if None);
+    # a resumed run keeps the entropy it was started with
+    rng = RunRNG(config.run_seed if resumed is None else resumed['entropy'])
+    replay_dir = config.replay_export_dir
+
+    seed = config.map_seed
+
+    # Generate items and terrain once; the compiled map is shared by evaluation and rendering
+    grid_map = GridMap.from_seed(seed, config.grid_width, config.grid_height)
+    # Robust fitness: the map set is generated once and every genome is scored on all of it
+    robust_maps = None
+    if config.robust_map_count > 1:
+        robust_maps = [grid_map] + [GridMap.from_seed(seed + offset, config.grid_width, config.grid_height)
+                                    for offset in range(1, config.robust_map_count)]
+
+    # Hall-of-fame warm start: the best archived genomes for this (or a similar) map lead the initial population
+    archived = warm_start_genomes(config)
+
+    # Island model: population_size is split over island_count processes that exchange their best agents
+    if config.island_count > 1:
+        top, history, island_results = run_islands(grid_map, config, robust_maps, rng, archived)
+        results = finish_run(top, history, grid_map, config, rng, headless)
+        results['islands'] = island_results
+        return results
+
+    # Steady-state mode: children are bred and inserted as evaluations finish, no generation barrier
+    if config.ga_mode == 'steady_state':
+        top, history, steady_state_results = run_steady_state(grid_map, config, rng, archived)
+        results = finish_run(top, history, grid_map, config, rng, headless)
+        results['steady_state'] = steady_state_results
+        results['fitness_bound'] = steady_state_results['fitness_bound']
+        results['early_stop'] = steady_state_results['early_stop']
+        return results
+    if config.ga_mode != 'generational':
+        raise ValueError("Invalid GA_MODE. Choose 'generational' or 'steady_state'.")
+
+    # Initialize population; heuristic initialization seeds part of it with shortest-path tours
+    seeder = make_seeder(grid_map, config, rng)
+    population = initial_population(config, rng, seeder, archived=archived)
+
+    evaluator = PopulationEvaluator(grid_map, backend=config.evaluation_backend,
+                                    cache_size=config.fitness_cache_size, workers=config.evaluation_workers,
+                                    checkpoint_interval=config.checkpoint_interval, robust_maps=robust_maps,
+                                    aggregate=config.robust_aggregate, quantile=config.robust_quantile)
+    # Metrics and profile files are written under the run's output directory (absolute paths are kept)
+    metrics_path = None
+    if config.metrics_path is not None:
+        metrics_path = os.path.join(config.output_dir, config.metrics_path)
+        os.makedirs(os.path.dirname(metrics_path) or '.', exist_ok=True)
+    if config.profile_generations is not None:
+        os.makedirs(config.output_dir, exist_ok=True)
+    instrumentation = Instrumentation(metrics_path, config.profile_generations,
+                                      os.path.join(config.output_dir, 'profile_generations.prof'))
+
+    # Fitness upper bound of the map for early stopping (its search is slow on large boards, so it is
+    # skipped when EARLY_STOP_GAP is None); over robust maps it is aggregated like the fitness itself
+    fitness_bound = None
+    if config.early_stop_gap is not None:
+        fitness_bound, bound_route = fitness_upper_bound(grid_map, config.genome_length)
+        route = (f"{bound_route['items_collected']} items for a movement cost of {bound_route['collection_cost']}, "
+                 f"{bound_route['new_tiles']} new tiles, no revisits")
+        if robust_maps is not None:
+            bounds = np.array([[fitness_upper_bound(robust_map, config.genome_length)[0]]
+                               for robust_map in robust_maps])
+            fitness_bound = float(aggregate_fitness(bounds, config.robust_aggregate, config.robust_quantile)[0])
+            route = f"{config.robust_aggregate} over {len(robust_maps)} maps; primary map route: {route}"
+        print(f"Fitness upper bound: {fitness_bound:.2f} ({route})")
+    early_stop = None
+
+    # Memetic local search on the elites, with a per-generation budget of simulated genes
+    local_search = None
+    if config.memetic_budget:
+        if robust_maps is not None:
+            raise ValueError("Memetic local search scores edits on the primary map only; use ROBUST_MAP_COUNT = 1.")
+        local_search = LocalSearch(grid_map, rng.local_search, evaluator.checkpoint_interval)
+    # Live telemetry: metrics and the best genome go to a background thread serving them over HTTP
+    telemetry = None
+    if config.telemetry_port is not None:
+        telemetry = Telemetry(grid_map, config.telemetry_port, config.telemetry_queue_size)
+        print(f"Live telemetry at {telemetry.url}")
+    memetic_totals = {'candidates': 0, 'accepted': 0, 'steps': 0, 'fitness_gain': 0.0, 'seconds': 0.0}
+    evaluation_seconds = 0.0
 
     # Logging for visualization
     best_fitness_history = []
@@ -39,37 +122,96 @@ def genetic_algorithm():
     unique_positions_history = []  # For plotting exploration
     revisits_history = []           # For plotting backtracking
     # actions_taken_history = []    # Not tracked currently
+    history = {
+        'best_fitness': best_fitness_history,
+        'avg_fitness': avg_fitness_history,
+        'worst_fitness': worst_fitness_history,
+        'unique_positions': unique_positions_history,
+        'revisits': revisits_history,
+        'elapsed': [],  # Seconds since the start of the run at the end of each generation
+    }
 
     # Tracking for dynamic mutation rate
+    mutation_rate = config.initial_mutation_rate
     best_fitness_overall = float('-inf')
     generations_without_improvement = 0
 
-    for generation in range(GENERATIONS):
-        # Evaluates fitness for each agent
-        for agent in population:
-            game_sim = GameSimulation(seed=seed, initial_items=initial_items, initial_terrain=initial_terrain)
-            game_sim.simulate(agent)
+    # Resumes from the latest run checkpoint: its population is already evaluated and sorted
+    start_generation = 0
+    if resumed is not None:
+        start_generation = resumed['generation']
+        population = resumed['population']
+        mutation_rate = resumed['mutation_rate']
+        rng.set_state(resumed['rng_state'])
+        generations_without_improvement = resumed['generations_without_improvement']
+        best_fitness_overall = resumed['best_fitness_overall']
+        for key, values in resumed['history'].items():
+            history[key][:] = values
+        print(f"Resuming from the checkpoint of generation {start_generation} in '{checkpoint_dir}'.")
+    # Resumed runs continue the clock from the checkpointed generation
+    start = time.perf_counter() - (history['elapsed'][-1] if history['elapsed'] else 0.0)
+
+    for generation in range(start_generation, config.generations):
+        instrumentation.start_generation(generation)
+
+        if resumed is not None and generation == start_generation:
+            eval_stats = {}
+        else:
+            # Evaluates fitness for each agent
+            with instrumentation.phase('evaluation'):
+                evaluation_began = time.perf_counter()
+                eval_stats = evaluator.evaluate(population)
+                evaluation_seconds += time.perf_counter() - evaluation_began
+
+            # Sorts population by fitness
+            with instrumentation.phase('sorting'):
+                population = population.take(population.fitness_order())
 
-        # Sorts population by fitness
-        population.sort(key=lambda x: x.fitness, reverse=True)
+            # Memetic stage: hill-climbs the elites, then re-sorts since their fitness may have risen
+            if local_search is not None:
+                with instrumentation.phase('local_search'):
+                    memetic_budget = generation_budget(config.memetic_budget, eval_stats)
+                    memetic_stats = local_search.improve(population, range(config.elite_size), memetic_budget)
+                    population = population.take(population.fitness_order())
+                for key, value in memetic_stats.items():
+                    memetic_totals[key] += value
+                    eval_stats['memetic_' + key] = value
+
+            # Saves the evaluated generation and the loop state so a crashed run can resume here
+            if checkpoint_dir and config.run_checkpoint_every and generation % config.run_checkpoint_every == 0:
+                with instrumentation.phase('checkpoint'):
+                    save_run_checkpoint(checkpoint_dir, generation, population, mutation_rate,
+                                        generations_without_improvement, best_fitness_overall, history, rng, config)
         best_agent = population[0]
         worst_agent = population[-1]
-        avg_fitness = sum(agent.fitness for agent in population) / POPULATION_SIZE
+        avg_fitness = float(population.fitness.mean())
 
         # Logs fitness and new metrics
         best_fitness_history.append(best_agent.fitness)
         avg_fitness_history.append(avg_fitness)
         worst_fitness_history.append(worst_agent.fitness)
-        unique_positions_history.append(len(best_agent.positions_visited))
-        revisits = sum(best_agent.position_visit_counts.values()) - len(best_agent.positions_visited)
-        revisits_history.append(revisits)
+        unique_positions_history.append(best_agent.unique_positions)
+        revisits_history.append(best_agent.revisits)
         # actions_taken_history.append(best_agent.actions_taken)  # Not tracked currently
 
         # Prints generation statistics
-        print(f"Generation {generation}, Best fitness: {best_agent.fitness:.2f}, "
-              f"Average fitness: {avg_fitness:.2f}, Items Collected: {best_agent.items_collected}, "
-              f"Movement Cost: {best_agent.total_movement_cost}, "
-              f"Unique Positions: {len(best_agent.positions_visited)}, Revisits: {revisits}")
+        eval_info = ""
+        if 'cache_hits' in eval_stats:
+            eval_info += f", Cache hits: {eval_stats['cache_hits']}, Cache misses: {eval_stats['cache_misses']}"
+        if 'steps_resumed' in eval_stats:
+            eval_info += f", Steps resumed: {eval_stats['steps_resumed']}"
+        if eval_stats.get('dead_gene_skips'):
+            eval_info += f", Dead-gene skips: {eval_stats['dead_gene_skips']}"
+        if 'dedup_fraction' in eval_stats:
+            eval_info += f", Steps deduplicated: {eval_stats['dedup_fraction']:.1%}"
+        if 'memetic_candidates' in eval_stats:
+            eval_info += (f", Memetic: +{eval_stats['memetic_fitness_gain']:.2f} "
+                          f"({eval_stats['memetic_accepted']}/{eval_stats['memetic_candidates']} edits kept)")
+        if generation % config.log_interval == 0 or generation == config.generations - 1:
+            print(f"Generation {generation}, Best fitness: {best_agent.fitness:.2f}, "
+                  f"Average fitness: {avg_fitness:.2f}, Items Collected: {best_agent.items_collected}, "
+                  f"Movement Cost: {best_agent.total_movement_cost}, "
+                  f"Unique Positions: {best_agent.unique_positions}, Revisits: {best_agent.revisits}{eval_info}")
 
         # Checks for improvement
         if best_agent.fitness > best_fitness_overall:
@@ -79,83 +221,175 @@ def genetic_algorithm():
             generations_without_improvement += 1
 
         # Detects stagnation
-        if generations_without_improvement >= STAGNATION_THRESHOLD:
+        if generations_without_improvement >= config.stagnation_threshold:
             print(f"Stagnation detected at generation {generation}. Increasing mutation rate.")
-            INITIAL_MUTATION_RATE = min(INITIAL_MUTATION_RATE * 1.5, 1.0)  # Cap mutation rate at 1.0
+            mutation_rate = min(mutation_rate * 1.5, 1.0)  # Cap mutation rate at 1.0
             generations_without_improvement = 0  # Reset counter after increasing mutation rate
 
+        # Exports the generation's best agent as an animated replay for offline review
+        if replay_dir and generation % config.replay_export_every == 0:
+            with instrumentation.phase('replay_export'):
+                export_replay(best_agent, grid_map, replay_dir, f'generation_{generation:05d}.gif')
+
+        instrumentation.record(best_fitness=best_agent.fitness, avg_fitness=avg_fitness,
+                               worst_fitness=worst_agent.fitness, mutation_rate=mutation_rate,
+                               **eval_stats)
+
         # Selection and reproduction
-        next_generation = population[:ELITE_SIZE]  # Elitism: retain top agents
-
-        while len(next_generation) < POPULATION_SIZE:
-            if SELECTION_METHOD == 'adaptive_tournament':
-                parent1 = adaptive_tournament_selection(population, generation)
-                parent2 = adaptive_tournament_selection(population, generation)
-            elif SELECTION_METHOD == 'rank_based':
-                parent1 = rank_based_selection(population)
-                parent2 = rank_based_selection(population)
-            else:
-                raise ValueError("Invalid SELECTION_METHOD. Choose 'adaptive_tournament' or 'rank_based'.")
-
-            # Performs two-point crossover
-            child_genome = two_point_crossover(parent1.genome, parent2.genome)
-            # Performs swap mutation
-            child_genome = swap_mutation(child_genome, INITIAL_MUTATION_RATE)
-            # Creates a new agent
-            next_generation.append(Agent(genome=child_genome))
-
-        # Introduces random immigrants to maintain diversity
-        num_immigrants = int(IMMIGRATION_RATE * POPULATION_SIZE)
-        for _ in range(num_immigrants):
-            next_generation.append(Agent())
-
-        # Truncate to maintain population size
-        population = next_generation[:POPULATION_SIZE]
+        population = reproduce(population, generation, mutation_rate, config, instrumentation, rng, seeder)
 
         # Decrease mutation rate over generations dynamically
-        INITIAL_MUTATION_RATE = max(MIN_MUTATION_RATE, INITIAL_MUTATION_RATE * 0.99) #can change to 0.999
+        mutation_rate = max(config.min_mutation_rate, mutation_rate * 0.99) #can change to 0.999
+
+        history['elapsed'].append(time.perf_counter() - start)
+        instrumentation.end_generation()
+
+        # Hands the generation to the telemetry thread without waiting for it
+        if telemetry is not None:
+            elapsed = history['elapsed']
+            generation_seconds = elapsed[-1] - (elapsed[-2] if len(elapsed) > 1 else 0.0)
+            per_second = 1 / generation_seconds if generation_seconds else 0.0
+            best_stats = dict(zip(Population.STATS, best_agent.population.get_stats(best_agent.index)))
+            telemetry.publish({
+                'generation': generation,
+                'best_fitness': best_fitness_history[-1],
+                'avg_fitness': avg_fitness,
+                'worst_fitness': worst_fitness_history[-1],
+                'unique_positions': unique_positions_history[-1],
+                'revisits': revisits_history[-1],
+                'mutation_rate': mutation_rate,
+                'elapsed': elapsed[-1],
+                'generations_per_second': per_second,
+                'evaluations_per_second': len(population) * per_second,
+                'steps_per_second': eval_stats.get('steps_executed', 0) * per_second,
+            }, best_agent.genome, best_stats)
+
+        # Stops once the best agent is close enough to the bound or has plateaued
+        reason = early_stop_reason(best_fitness_history, fitness_bound, config.early_stop_gap,
+                                   config.plateau_window, config.plateau_min_improvement)
+        if reason is not None and generation + 1 < config.generations:
+            generations_saved = config.generations - generation - 1
+            seconds_per_generation = history['elapsed'][-1] / len(history['elapsed'])
+            early_stop = {
+                'reason': reason,
+                'generation': generation,
+                'generations_saved': generations_saved,
+                'seconds_saved': generations_saved * seconds_per_generation,  # Estimate at the mean generation time
+            }
+            print(f"\nStopping early after generation {generation}: {reason}. Saved {generations_saved} generations "
+                  f"(~{early_stop['seconds_saved']:.1f}s).")
+            break
 
+    evaluator.close()
+    instrumentation.close()
+    if telemetry is not None:
+        telemetry.close()
+
+    results = finish_run(population, history, grid_map, config, rng, headless)
+    results['fitness_bound'] = fitness_bound
+    results['early_stop'] = early_stop
+    if local_search is not None:
+        # Fitness the elites gained per second of local search, next to the population's evaluation time
+        seconds = memetic_totals['seconds']
+        results['memetic'] = dict(memetic_totals, evaluation_seconds=evaluation_seconds,
+                                  fitness_gain_per_second=memetic_totals['fitness_gain'] / seconds if seconds else 0.0)
+        print(f"Memetic local search: +{memetic_totals['fitness_gain']:.2f} elite fitness from "
+              f"{memetic_totals['accepted']}/{memetic_totals['candidates']} kept edits in {seconds:.2f}s "
+              f"({results['memetic']['fitness_gain_per_second']:.1f} fitness/s; population evaluation took "
+              f"{evaluation_seconds:.2f}s).")
+    return results
+
+# Writes the best agent's playthrough as an animated image from its recorded trajectory
+def export_replay(agent, grid_map, replay_dir, name):
+    os.makedirs(replay_dir, exist_ok=True)
+    trajectory = record_trajectory(grid_map, agent.genome, agent.fitness)
+    return export_animation(trajectory, os.path.join(replay_dir, name))
+
+# Reports, saves and plots the best agent of a finished run (`top` is sorted best first), archives
+# its top agents, then replays the best one unless headless
+def finish_run(top, history, grid_map, config, rng, headless):
+    best_agent = top[0]
     # After all generations are complete, output the best agent's performance
-    best_agent = population[0]
     print("\nBest Agent after all generations:")
     print(f"Fitness: {best_agent.fitness:.2f}")
     print(f"Items Collected: {best_agent.items_collected}")
     print(f"Total Movement Cost: {best_agent.total_movement_cost}")
-    print(f"Unique Positions: {len(best_agent.positions_visited)}")
-    revisits = sum(best_agent.position_visit_counts.values()) - len(best_agent.positions_visited)
-    print(f"Revisits: {revisits}")
+    print(f"Unique Positions: {best_agent.unique_positions}")
+    print(f"Revisits: {best_agent.revisits}")
     # print(f"Actions Taken: {best_agent.actions_taken}")  # Not tracked currently
 
     # Saves the best agent's genome
-    with open('best_agent.pkl', 'wb') as f:
-        pickle.dump(best_agent.genome, f)
-    print("Best agent's genome saved to 'best_agent.pkl'.")
+    os.makedirs(config.output_dir, exist_ok=True)
+    genome_path = os.path.join(config.output_dir, 'best_agent.pkl')
+    with open(genome_path, 'wb') as f:
+        pickle.dump(best_agent.genome.tolist(), f)
+    print(f"Best agent's genome saved to '{genome_path}'.")
+
+    # Plots are written to files; headless runs use the non-GUI Agg backend and never block on a window
+    plot_paths = plot_history(history, show=not headless, output_dir=config.output_dir)
+
+    results = {
+        'best_genome': best_agent.genome.tolist(),
+        'best_fitness': best_agent.fitness,
+        'items_collected': best_agent.items_collected,
+        'total_movement_cost': best_agent.total_movement_cost,
+        'unique_positions': best_agent.unique_positions,
+        'revisits': best_agent.revisits,
+        'history': history,
+        'plot_paths': plot_paths,
+        'seed': config.map_seed,
+        'run_seed': rng.entropy,  # Pass as run_seed to repeat this run
+        'config': config.to_dict(),
+        'archive': archive_run(config, top, rng.entropy),
+    }
+    if config.replay_export_dir:
+        results['replay_path'] = export_replay(best_agent, grid_map, config.replay_export_dir, 'best_agent.gif')
+        print(f"Best agent's replay saved to '{results['replay_path']}'.")
+    if headless:
+        return results
+
+    # Renders the best agent's run
+    from .render import render_game  # Imports pyxel only when a replay is requested
+    print("\nRendering the best agent from the final generation...")
+    render_game(best_agent, grid_map, title="Best Agent - Final Generation", max_frames=None)
+    return results
+
+# Plots fitness, exploration and backtracking over generations and returns the saved file paths
+def plot_history(history, show=True, output_dir='.'):
+    import matplotlib
+    if not show:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
 
     # Plots fitness over generations
     plt.figure(figsize=(12, 6))
-    plt.plot(best_fitness_history, label='Best Fitness', color='green')
-    plt.plot(avg_fitness_history, label='Average Fitness', color='blue')
-    plt.plot(worst_fitness_history, label='Worst Fitness', color='red')
+    plt.plot(history['best_fitness'], label='Best Fitness', color='green')
+    plt.plot(history['avg_fitness'], label='Average Fitness', color='blue')
+    plt.plot(history['worst_fitness'], label='Worst Fitness', color='red')
     plt.xlabel('Generation')
     plt.ylabel('Fitness')
     plt.title('Fitness over Generations')
     plt.legend()
     plt.grid(True)
-    plt.savefig('fitness_over_generations.png')
-    plt.show()
+    fitness_path = os.path.join(output_dir, 'fitness_over_generations.png')
+    plt.savefig(fitness_path)
+    if show:
+        plt.show()
+    plt.close()
 
     # Plots exploration and backtracking over generations
     plt.figure(figsize=(12, 6))
-    plt.plot(unique_positions_history, label='Unique Positions', color='purple')
-    plt.plot(revisits_history, label='Revisits', color='orange')
+    plt.plot(history['unique_positions'], label='Unique Positions', color='purple')
+    plt.plot(history['revisits'], label='Revisits', color='orange')
     plt.xlabel('Generation')
     plt.ylabel('Count')
     plt.title('Exploration and Backtracking over Generations')
     plt.legend()
     plt.grid(True)
-    plt.savefig('exploration_backtracking_over_generations.png')
-    plt.show()
+    exploration_path = os.path.join(output_dir, 'exploration_backtracking_over_generations.png')
+    plt.savefig(exploration_path)
+    if show:
+        plt.show()
+    plt.close()
 
-    # Renders the best agent's run
-    print("\nRendering the best agent from the final generation...")
-    render_game(best_agent, seed, initial_items, initial_terrain, title="Best Agent - Final Generation", max_frames=None)
\ No newline at end of file
+    return [fitness_path, exploration_path]
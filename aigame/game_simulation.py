@@ -1,154 +1,216 @@
-import random
-import copy
-
-from .constants import ACTIONS
+import struct
+
+from .grid_map import GridMap, MOVEMENT_COSTS
+
+# Snapshot packing: a row's evaluator checkpoints are kept as one bytes blob of fixed-size records
+# instead of a list of tuples (about 1 KB each on a 10x10 map). A record holds the scalar fields
+# and both bitboards at ceil(grid_width / 8) bytes per row.
+SNAPSHOT_SCALARS = struct.Struct('<9iQ?')  # step, cell, score, cost, items, visible, unique, moves, genes; mask; won
+
+class SnapshotCodec:
+    def __init__(self, grid_map):
+        self.grid_height = grid_map.grid_height
+        self.row_bytes = -(-grid_map.grid_width // 8)
+        self.size = SNAPSHOT_SCALARS.size + 2 * grid_map.grid_height * self.row_bytes
+
+    def pack(self, snapshots):
+        row_bytes = self.row_bytes
+        records = []
+        for (step, cell, score, cost, items, items_mask, visible_rows, visible_count, visited_rows,
+             unique_positions, moves, game_won, genes_played) in snapshots:
+            records.append(SNAPSHOT_SCALARS.pack(step, cell, score, cost, items, visible_count, unique_positions,
+                                                 moves, genes_played, items_mask, game_won))
+            records.extend(row.to_bytes(row_bytes, 'little') for row in visible_rows)
+            records.extend(row.to_bytes(row_bytes, 'little') for row in visited_rows)
+        return b''.join(records)
+
+    def count(self, blob):
+        return len(blob) // self.size
+
+    # Snapshot tuple of the index-th record (negative indices count from the end)
+    def unpack(self, blob, index):
+        start = (index % self.count(blob)) * self.size
+        (step, cell, score, cost, items, visible_count, unique_positions, moves, genes_played, items_mask,
+         game_won) = SNAPSHOT_SCALARS.unpack_from(blob, start)
+        offset, row_bytes, height = start + SNAPSHOT_SCALARS.size, self.row_bytes, self.grid_height
+        rows = [int.from_bytes(blob[offset + i * row_bytes:offset + (i + 1) * row_bytes], 'little')
+                for i in range(2 * height)]
+        return (step, cell, score, cost, items, items_mask, tuple(rows[:height]), visible_count,
+                tuple(rows[height:]), unique_positions, moves, game_won, genes_played)
 
 class GameSimulation:
-    def __init__(self, seed=None, initial_items=None, initial_terrain=None):
-        if seed is not None:
-            random.seed(seed)
-            self.seed = seed
-        else:
-            self.seed = None
-
-        self.grid_width = 10
-        self.grid_height = 10
-
-        self.player_x = self.grid_width // 2
-        self.player_y = self.grid_height // 2
-
-        self.score = 100
-
-        if initial_items is not None and initial_terrain is not None:
-            self.initial_items = initial_items
-            self.initial_terrain = initial_terrain
-        else:
-            # Generate items and terrain
-            self.generate_items()
-            self.generate_terrain()
-            self.initial_items = copy.deepcopy(self.items)
-            self.initial_terrain = copy.deepcopy(self.terrain)
-
-        # Going into water is bad. Kept high cost
-        self.movement_costs = {
-            'normal': 1,
-            'mud': 10,
-            'water': 50
-        }
-
-        self.visible_tiles = set()
-        self.update_visibility()
-
-        self.game_won = False
-
-        # Tracking variables
-        self.total_movement_cost = 0
-        self.items_collected = 0
-        self.positions_visited = set()  # For advanced fitness
-        self.positions_visited.add((self.player_x, self.player_y))
-        self.position_visit_counts = {(self.player_x, self.player_y): 1}  # Starting position visited once
-
-    def generate_items(self):
-        self.items = {}
-        for _ in range(5):  # Spawn only 5 items
-            while True:
-                x = random.randint(0, self.grid_width - 1)
-                y = random.randint(0, self.grid_height - 1)
-                if (x, y) != (self.player_x, self.player_y) and (x, y) not in self.items:
-                    self.items[(x, y)] = 'positive'  # Only positive items for positive points
-                    break
-
-    def generate_terrain(self):
-        self.terrain = {}
-        for x in range(self.grid_width):
-            for y in range(self.grid_height):
-                terrain_type = random.choices(
-                    ['normal', 'mud', 'water'],
-                    weights=[0.7, 0.2, 0.1],
-                    k=1
-                )[0]
-                self.terrain[(x, y)] = terrain_type
+    def __init__(self, seed=None, initial_items=None, initial_terrain=None, grid_map=None):
+        self.seed = seed
 
-    def update_visibility(self):
-        x, y = self.player_x, self.player_y
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.grid_width and 0 <= ny < self.grid_height:
-                    self.visible_tiles.add((nx, ny))
-
-    def simulate(self, agent):
-        # Resets game state for each simulation
-        self.player_x = self.grid_width // 2
-        self.player_y = self.grid_height // 2
+        if grid_map is None:
+            if initial_items is not None and initial_terrain is not None:
+                grid_map = GridMap(initial_items, initial_terrain)
+            else:
+                # Generate items and terrain
+                grid_map = GridMap.from_seed(seed)
+        self.grid_map = grid_map
+
+        self.grid_width = grid_map.grid_width
+        self.grid_height = grid_map.grid_height
+        self.initial_items = grid_map.initial_items
+        self.initial_terrain = grid_map.initial_terrain
+        self.movement_costs = MOVEMENT_COSTS
+
+        self.reset()
+
+    @property
+    def player_x(self):
+        return self.player_cell % self.grid_width
+
+    @property
+    def player_y(self):
+        return self.player_cell // self.grid_width
+
+    # Resets game state to the start of a run.
+    # Visibility and visited tiles are bitboards (one int per grid row), remaining items a bitmask over item slots.
+    def reset(self):
+        self.player_cell = self.grid_map.start_cell
         self.score = 100
-        self.visible_tiles = set()
-        self.update_visibility()
+        self.visible_rows = [0] * self.grid_height
+        self.visible_count = 0
         self.game_won = False
 
         # Resets tracking variables
         self.total_movement_cost = 0
         self.items_collected = 0
-        self.positions_visited = set()
-        self.positions_visited.add((self.player_x, self.player_y))
-        self.position_visit_counts = {(self.player_x, self.player_y): 1}  # Starting position visited once
+        self.visited_rows = [0] * self.grid_height  # For advanced fitness
+        self.visited_rows[self.grid_map.cell_rows[self.player_cell]] = self.grid_map.cell_bits[self.player_cell]
+        self.unique_positions = 1  # Starting position visited once
+        self.moves = 0  # Successful moves; every move is one more visit
+        self.genes_played = 0  # Genes executed so far; genes after the game ended are dead
+
+        # Resets items to initial state; terrain doesn't change during the game
+        self.items_mask = self.grid_map.all_items_mask
+        self.update_visibility()
 
-        # Resets items and terrain to initial state
-        self.items = copy.deepcopy(self.initial_items)
-        self.terrain = self.initial_terrain  # Terrain doesn't change during the game
+    # ORs the 3x3 neighbourhood of the player into the visibility rows, counting newly revealed tiles
+    def update_visibility(self):
+        visible_rows = self.visible_rows
+        for row, mask in self.grid_map.reveal_masks[self.player_cell]:
+            revealed = mask & ~visible_rows[row]
+            if revealed:
+                visible_rows[row] |= revealed
+                self.visible_count += revealed.bit_count()
+
+    def is_visible(self, cell):
+        return bool(self.visible_rows[self.grid_map.cell_rows[cell]] & self.grid_map.cell_bits[cell])
+
+    # Cells that still hold an item
+    def remaining_item_cells(self):
+        return [cell for slot, cell in enumerate(self.grid_map.item_cells) if self.items_mask >> slot & 1]
+
+    # Compact copy of the game state after the first `step` genes have been played
+    def snapshot(self, step):
+        return (
+            step,
+            self.player_cell,
+            self.score,
+            self.total_movement_cost,
+            self.items_collected,
+            self.items_mask,
+            tuple(self.visible_rows),
+            self.visible_count,
+            tuple(self.visited_rows),
+            self.unique_positions,
+            self.moves,
+            self.game_won,
+            self.genes_played,
+        )
 
-        for action in agent.genome:
+    def restore(self, snapshot):
+        (_, self.player_cell, self.score, self.total_movement_cost, self.items_collected, self.items_mask,
+         visible_rows, self.visible_count, visited_rows, self.unique_positions, self.moves,
+         self.game_won, self.genes_played) = snapshot
+        self.visible_rows = list(visible_rows)
+        self.visited_rows = list(visited_rows)
+
+    # Plays the agent's genome and writes the results onto it.
+    # With checkpoint_interval > 0, returns snapshots taken every checkpoint_interval genes;
+    # resume_from continues from a snapshot of a genome sharing the same prefix.
+    def simulate(self, agent, checkpoint_interval=0, resume_from=None):
+        if resume_from is None:
+            # Resets game state for each simulation
+            self.reset()
+            start = 0
+        else:
+            self.restore(resume_from)
+            start = resume_from[0]
+
+        checkpoints = []
+        genome = agent.genome.tolist()
+        # Genes actually played by this call; the rest were resumed over or cut off by early termination
+        self.steps_played = len(genome) - start
+        for step in range(start, len(genome)):
             if self.score <= 0 or self.game_won:
+                self.steps_played = step - start
                 break
-            self.move_player_action(action)
-            self.check_win_condition()
-            if self.game_won:
-                break
+            if checkpoint_interval and step > start and step % checkpoint_interval == 0:
+                checkpoints.append(self.snapshot(step))
+            self.step(genome[step])
+
+        self.write_results(agent)
+        return checkpoints
 
+    # Writes fitness and stats of the current game state onto the agent
+    def write_results(self, agent):
         agent.fitness = self.calculate_fitness()
         agent.items_collected = self.items_collected
         agent.total_movement_cost = self.total_movement_cost
+        agent.unique_positions = self.unique_positions
+        agent.revisits = self.moves + 1 - self.unique_positions
+        agent.effective_length = self.genes_played
+
+    def finished(self):
+        return self.score <= 0 or self.game_won
+
+    # Plays one action and checks for the win
+    def step(self, action):
+        self.genes_played += 1
+        self.move_player_action(action)
+        self.check_win_condition()
 
     def move_player_action(self, action):
-        dx, dy = ACTIONS.get(action, (0, 0))
-        new_x = self.player_x + dx
-        new_y = self.player_y + dy
-        if 0 <= new_x < self.grid_width and 0 <= new_y < self.grid_height:
-            # Get the terrain of the new tile
-            terrain = self.terrain.get((new_x, new_y), 'normal')
-            # Get the movement cost
-            cost = self.movement_costs.get(terrain, 1)
+        # A move is a lookup in the precomputed transition table, -1 means off the grid
+        new_cell = self.grid_map.transitions[self.player_cell][action]
+        if new_cell >= 0:
+            # Get the movement cost of the new tile
+            cost = self.grid_map.costs[new_cell]
             # Deduct the cost from the score
             self.score -= cost
             # Accumulate movement cost
             self.total_movement_cost += cost
             # Update player's position
-            self.player_x = new_x
-            self.player_y = new_y
+            self.player_cell = new_cell
             self.check_for_items()
-            self.update_visibility()
             if self.score <= 0:
                 self.score = 0
 
-            # Update visit counts
-            pos = (new_x, new_y)
-            if pos in self.position_visit_counts:
-                self.position_visit_counts[pos] += 1
-            else:
-                self.position_visit_counts[pos] = 1
-            self.positions_visited.add(pos)  # Only needs to be added once
+            # Update visit counts; a tile's neighbourhood only needs revealing on its first visit
+            self.moves += 1
+            row = self.grid_map.cell_rows[new_cell]
+            bit = self.grid_map.cell_bits[new_cell]
+            if not self.visited_rows[row] & bit:
+                self.visited_rows[row] |= bit
+                self.unique_positions += 1
+                self.update_visibility()
 
     def check_for_items(self):
-        if (self.player_x, self.player_y) in self.items:
-            item = self.items.pop((self.player_x, self.player_y))
-            if item == 'positive':
-                self.score += 15
+        slot = self.grid_map.item_slots[self.player_cell]
+        if slot >= 0 and self.items_mask >> slot & 1:
+            self.items_mask &= ~(1 << slot)
+            reward = self.grid_map.item_reward_list[slot]
+            if reward > 0:  # 'positive' item
+                self.score += reward
                 self.items_collected += 1
 
+    # Constant time: no item bits left and every tile revealed
     def check_win_condition(self):
-        all_items_collected = len(self.items) == 0
-        all_tiles_explored = len(self.visible_tiles) == self.grid_width * self.grid_height
-        if all_items_collected and all_tiles_explored:
+        if self.items_mask == 0 and self.visible_count == self.grid_map.num_cells:
             self.game_won = True
 
     def calculate_fitness(self):
@@ -158,8 +220,8 @@ class GameSimulation:
         uncollected_items = 5 - items_collected  # Assumes 5 items
 
         # Other metrics for exploration and backtracking
-        unique_positions = len(self.positions_visited)
-        total_positions_visited = sum(self.position_visit_counts.values())
+        unique_positions = self.unique_positions
+        total_positions_visited = self.moves + 1  # Starting position plus one visit per move
         revisits = total_positions_visited - unique_positions  # Number of times positions were revisited
 
         # Fitness calculation
@@ -172,4 +234,4 @@ class GameSimulation:
             - (revisits * 10)                      # Penalize for backtracking / default 10
         )
 
-        return fitness
\ No newline at end of file
+        return fitness
@@ -0,0 +1,22 @@
+import numpy as np
+
+# Genome Packing: actions are 0-3, so four genes fit in one byte (gene i*4+j in bits 2j..2j+1).
+# Packed rows are plain uint8 and can be written to disk and memory-mapped as-is.
+GENES_PER_BYTE = 4
+
+def packed_length(genome_length):
+    return -(-genome_length // GENES_PER_BYTE)
+
+def pack_genomes(genomes):
+    genomes = np.asarray(genomes, dtype=np.uint8)
+    size, genome_length = genomes.shape
+    padded = np.zeros((size, packed_length(genome_length) * GENES_PER_BYTE), dtype=np.uint8)
+    padded[:, :genome_length] = genomes
+    return (padded[:, 0::4] | (padded[:, 1::4] << 2) | (padded[:, 2::4] << 4) | (padded[:, 3::4] << 6)).astype(np.uint8)
+
+def unpack_genomes(packed, genome_length):
+    packed = np.asarray(packed, dtype=np.uint8)
+    genomes = np.empty((len(packed), packed.shape[1] * GENES_PER_BYTE), dtype=np.uint8)
+    for j in range(GENES_PER_BYTE):
+        genomes[:, j::4] = (packed >> (2 * j)) & 3
+    return genomes[:, :genome_length]
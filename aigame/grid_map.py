@@ -0,0 +1,122 @@
+import random
+import numpy as np
+
+from .constants import ACTIONS, GRID_WIDTH, GRID_HEIGHT
+
+# Going into water is bad. Kept high cost
+MOVEMENT_COSTS = {
+    'normal': 1,
+    'mud': 10,
+    'water': 50
+}
+
+def generate_items(grid_width, grid_height, start, rng=random):
+    items = {}
+    for _ in range(5):  # Spawn only 5 items
+        while True:
+            x = rng.randint(0, grid_width - 1)
+            y = rng.randint(0, grid_height - 1)
+            if (x, y) != start and (x, y) not in items:
+                items[(x, y)] = 'positive'  # Only positive items for positive points
+                break
+    return items
+
+def generate_terrain(grid_width, grid_height, rng=random):
+    terrain = {}
+    for x in range(grid_width):
+        for y in range(grid_height):
+            terrain_type = rng.choices(
+                ['normal', 'mud', 'water'],
+                weights=[0.7, 0.2, 0.1],
+                k=1
+            )[0]
+            terrain[(x, y)] = terrain_type
+    return terrain
+
+# Grid Map: the map compiled once into flat per-cell tables, cell = y * grid_width + x.
+# Shared by GameSimulation, BatchSimulation and the renderer as the single source of map truth.
+class GridMap:
+    def __init__(self, initial_items, initial_terrain, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.num_cells = grid_width * grid_height
+        self.start_cell = self.cell_of(grid_width // 2, grid_height // 2)
+
+        # Keeps the original dicts for rendering and pickling the best agent's map
+        self.initial_items = initial_items
+        self.initial_terrain = initial_terrain
+
+        # Terrain name and movement cost per cell
+        self.terrain = ['normal'] * self.num_cells
+        for (x, y), terrain in initial_terrain.items():
+            self.terrain[self.cell_of(x, y)] = terrain
+        self.costs = [MOVEMENT_COSTS.get(terrain, 1) for terrain in self.terrain]
+        self.cost_array = np.array(self.costs, dtype=np.int64)
+
+        # Item index: item kind per cell, and a slot number per item cell (-1 if none)
+        self.items = {self.cell_of(x, y): item for (x, y), item in initial_items.items()}
+        self.item_cells = sorted(self.items)
+        self.item_slot = np.full(self.num_cells, -1, dtype=np.int64)
+        self.item_slot[self.item_cells] = np.arange(len(self.item_cells))
+        self.item_rewards = np.array([15 if self.items[cell] == 'positive' else 0 for cell in self.item_cells],
+                                     dtype=np.int64)
+        self.item_positive = (self.item_rewards > 0).astype(np.int64)
+        self.item_slots = self.item_slot.tolist()
+        self.item_reward_list = self.item_rewards.tolist()
+        self.all_items_mask = (1 << len(self.item_cells)) - 1  # Bit per item slot
+
+        # Transition table: next cell for each of the four ACTIONS, -1 when the move leaves the grid
+        self.transitions = []
+        for cell in range(self.num_cells):
+            x, y = self.position_of(cell)
+            row = []
+            for action in range(len(ACTIONS)):
+                dx, dy = ACTIONS[action]
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < grid_width and 0 <= ny < grid_height:
+                    row.append(self.cell_of(nx, ny))
+                else:
+                    row.append(-1)
+            self.transitions.append(tuple(row))
+        self.transition_array = np.array(self.transitions, dtype=np.int64)
+
+        # Cells revealed by standing on a cell (3x3 neighbourhood)
+        self.neighbours = []
+        for cell in range(self.num_cells):
+            x, y = self.position_of(cell)
+            self.neighbours.append(tuple(
+                self.cell_of(x + dx, y + dy)
+                for dx in range(-1, 2)
+                for dy in range(-1, 2)
+                if 0 <= x + dx < grid_width and 0 <= y + dy < grid_height
+            ))
+        # Padded with the sentinel cell num_cells so every row has 9 entries (batched boards keep it always visible)
+        self.neighbour_array = np.array([row + (self.num_cells,) * (9 - len(row)) for row in self.neighbours],
+                                        dtype=np.int64)
+
+        # Bitboards: every grid row is an int with bit x set for column x, so per-step work does not
+        # grow with the board. A cell's 3x3 reveal is up to three (row, mask) pairs OR-ed into those rows.
+        self.cell_rows = [cell // grid_width for cell in range(self.num_cells)]
+        self.cell_bits = [1 << (cell % grid_width) for cell in range(self.num_cells)]
+        full_row = (1 << grid_width) - 1
+        self.reveal_masks = []
+        for cell in range(self.num_cells):
+            x, y = self.position_of(cell)
+            mask = ((0b111 << x) >> 1) & full_row
+            self.reveal_masks.append(tuple((row, mask) for row in (y - 1, y, y + 1) if 0 <= row < grid_height))
+
+    # Generates items and terrain from a seed, in the same RNG order the game always used.
+    # The map has its own Mersenne Twister stream, so a seed gives the same map as before and
+    # generating one leaves every other random state untouched.
+    @classmethod
+    def from_seed(cls, seed, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+        rng = random.Random(seed)
+        items = generate_items(grid_width, grid_height, (grid_width // 2, grid_height // 2), rng)
+        terrain = generate_terrain(grid_width, grid_height, rng)
+        return cls(items, terrain, grid_width, grid_height)
+
+    def cell_of(self, x, y):
+        return y * self.grid_width + x
+
+    def position_of(self, cell):
+        return cell % self.grid_width, cell // self.grid_width
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+
+from .genome_packing import pack_genomes, unpack_genomes
+
+# Hall of Fame: elite genomes of finished runs, kept across runs in one SQLite file.
+# Genomes are content-addressed: a genome's digest covers its 2-bit packed bytes and length, so the
+# same genome found by several runs (or merged in from several archives) is stored once. Each
+# (evaluation, genome) pair has one entry holding its fitness; the evaluation key names everything
+# the fitness depends on (map seed and size, genome length, robust map settings). Entries are
+# indexed by fitness, so the top genomes of a map are an index scan. New runs can warm-start from
+# them, falling back to the best genomes of other maps with the same grid size and genome length.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS genomes (
+    digest TEXT PRIMARY KEY,
+    genome_length INTEGER NOT NULL,
+    packed BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    evaluation TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES genomes (digest),
+    map_seed INTEGER NOT NULL,
+    grid_width INTEGER NOT NULL,
+    grid_height INTEGER NOT NULL,
+    genome_length INTEGER NOT NULL,
+    fitness REAL NOT NULL,
+    items_collected INTEGER NOT NULL,
+    run_seed TEXT,
+    added REAL NOT NULL,
+    PRIMARY KEY (evaluation, digest)
+);
+CREATE INDEX IF NOT EXISTS entries_by_fitness ON entries (evaluation, fitness DESC);
+CREATE INDEX IF NOT EXISTS entries_by_shape ON entries (grid_width, grid_height, genome_length, fitness DESC);
+"""
+
+# Everything a genome's fitness depends on, as a stable string
+def evaluation_key(config):
+    key = {'map_seed': config.map_seed, 'grid': [config.grid_width, config.grid_height],
+           'genome_length': config.genome_length}
+    if config.robust_map_count > 1:
+        key['robust'] = [config.robust_map_count, config.robust_aggregate, config.robust_quantile]
+    return json.dumps(key, sort_keys=True, separators=(',', ':'))
+
+def genome_digest(packed_row, genome_length):
+    return hashlib.blake2b(packed_row.tobytes() + genome_length.to_bytes(4, 'little'), digest_size=16).hexdigest()
+
+class HallOfFame:
+    def __init__(self, path):
+        self.path = path
+        # Parallel runs may write to the same archive; SQLite serialises them, waiting up to the timeout
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def genome_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM genomes").fetchone()[0]
+
+    # Adds the evaluated rows of a population; returns the number of new entries
+    def add(self, population, config, run_seed=None):
+        genome_length = population.genome_length
+        packed = pack_genomes(population.genomes)
+        digests = [genome_digest(row, genome_length) for row in packed]
+        evaluation = evaluation_key(config)
+        added = time.time()
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO genomes VALUES (?, ?, ?)",
+                [(digest, genome_length, row.tobytes()) for digest, row in zip(digests, packed)])
+            genome_changes = self.connection.total_changes - before
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(evaluation, digest, config.map_seed, config.grid_width, config.grid_height, genome_length,
+                  float(fitness), int(items), None if run_seed is None else str(run_seed), added)
+                 for digest, fitness, items in zip(digests, population.fitness, population.items_collected)])
+            return self.connection.total_changes - before - genome_changes
+
+    # Best archived entries for the config's evaluation, best first: (digest, fitness, evaluation) rows.
+    # With similar=True the remaining places go to the best genomes of other maps of the same shape.
+    def top(self, config, count, similar=True):
+        evaluation = evaluation_key(config)
+        rows = self.connection.execute(
+            "SELECT digest, fitness, evaluation FROM entries WHERE evaluation = ? ORDER BY fitness DESC LIMIT ?",
+            (evaluation, count)).fetchall()
+        if similar and len(rows) < count:
+            seen = {digest for digest, _, _ in rows}
+            for row in self.connection.execute(
+                    "SELECT digest, fitness, evaluation FROM entries WHERE grid_width = ? AND grid_height = ? "
+                    "AND genome_length = ? AND evaluation != ? ORDER BY fitness DESC",
+                    (config.grid_width, config.grid_height, config.genome_length, evaluation)):
+                if len(rows) == count:
+                    break
+                if row[0] not in seen:
+                    seen.add(row[0])
+                    rows.append(row)
+        return rows
+
+    # Unpacked genomes (one row per digest, in order)
+    def genomes(self, digests, genome_length):
+        if not digests:
+            return np.empty((0, genome_length), dtype=np.uint8)
+        packed = {}
+        for digest, packed_row in self.connection.execute(
+                f"SELECT digest, packed FROM genomes WHERE digest IN ({','.join('?' * len(digests))})", digests):
+            packed[digest] = np.frombuffer(packed_row, dtype=np.uint8)
+        return unpack_genomes(np.stack([packed[digest] for digest in digests]), genome_length)
+
+    # Copies every genome and entry of another archive file that this one lacks; returns the new entries
+    def merge(self, path):
+        if not os.path.exists(path):
+            raise ValueError(f"Archive '{path}' does not exist.")  # ATTACH would create an empty file there
+        if same_file(path, self.path):
+            raise ValueError(f"Cannot merge archive '{path}' into itself.")
+        before = len(self)
+        self.connection.execute("ATTACH DATABASE ? AS other", (path,))
+        try:
+            with self.connection:
+                self.connection.execute("INSERT OR IGNORE INTO genomes SELECT * FROM other.genomes")
+                self.connection.execute("INSERT OR IGNORE INTO entries SELECT * FROM other.entries")
+        finally:
+            self.connection.execute("DETACH DATABASE other")
+        return len(self) - before
+
+# True if both paths name the same existing file (an archive attached to itself would lock)
+def same_file(path, other):
+    return os.path.exists(path) and os.path.exists(other) and os.path.samefile(path, other)
+
+# Archived genomes a run starts from (config.warm_start of them, best first), or None
+def warm_start_genomes(config):
+    if not config.archive_path or not config.warm_start:
+        return None
+    with HallOfFame(config.archive_path) as archive:
+        rows = archive.top(config, config.warm_start)
+        genomes = archive.genomes([digest for digest, _, _ in rows], config.genome_length)
+    evaluation = evaluation_key(config)
+    same_map = sum(1 for _, _, row_evaluation in rows if row_evaluation == evaluation)
+    if rows:
+        print(f"Warm start: {len(rows)} archived genomes ({same_map} from this map, best fitness "
+              f"{rows[0][1]:.2f}) from '{config.archive_path}'.")
+    return genomes
+
+# Adds the top config.archive_size evaluated agents of a finished run (population sorted best
+# first) to the archive; returns a summary for the run results, or None without an archive
+def archive_run(config, population, run_seed=None):
+    if not config.archive_path:
+        return None
+    evaluated = np.flatnonzero(np.isfinite(population.fitness))[:config.archive_size]
+    with HallOfFame(config.archive_path) as archive:
+        added = archive.add(population.take(evaluated), config, run_seed)
+        entries, genomes = len(archive), archive.genome_count()
+    print(f"Hall of fame: {added} new of {len(evaluated)} archived agents, {entries} entries "
+          f"({genomes} distinct genomes) in '{config.archive_path}'.")
+    return {'path': config.archive_path, 'added': added, 'entries': entries, 'genomes': genomes}
@@ -0,0 +1,87 @@
+import cProfile
+import json
+import time
+from contextlib import nullcontext
+
+# Instrumentation: per-generation phase timings and counters streamed as one JSONL record per generation.
+# When disabled every hook is a no-op, so the GA loop can call it unconditionally.
+
+_NO_TIMING = nullcontext()
+
+class _PhaseTimer:
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        phases = self.instrumentation.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.start
+
+class Instrumentation:
+    def __init__(self, metrics_path=None, profile_generations=None, profile_path='profile_generations.prof'):
+        self.enabled = metrics_path is not None
+        self.metrics_file = open(metrics_path, 'w') if self.enabled else None
+        # Inclusive (first, last) generation range profiled with cProfile
+        self.profile_generations = profile_generations
+        self.profile_path = profile_path
+        self.profiler = None
+        self.phases = {}
+        self.counters = {}
+        self.generation = None
+        self.generation_start = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+        if self.profile_generations is not None and generation == self.profile_generations[0]:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if not self.enabled:
+            return
+        self.phases = {}
+        self.counters = {}
+        self.generation_start = time.perf_counter()
+
+    # Times a phase of the current generation: `with instrumentation.phase('evaluation'): ...`
+    def phase(self, name):
+        if not self.enabled:
+            return _NO_TIMING
+        return _PhaseTimer(self, name)
+
+    # Adds counters (step counts, cache/pool statistics, fitness summary) to the current record
+    def record(self, **counters):
+        if self.enabled:
+            self.counters.update(counters)
+
+    def end_generation(self):
+        if self.profiler is not None and self.generation >= self.profile_generations[1]:
+            self.stop_profiler()
+        if not self.enabled:
+            return
+        record = {
+            'generation': self.generation,
+            'seconds': time.perf_counter() - self.generation_start,
+            'phases': self.phases,
+        }
+        record.update(self.counters)
+        self.metrics_file.write(json.dumps(record) + '\n')
+        self.metrics_file.flush()
+
+    def stop_profiler(self):
+        self.profiler.disable()
+        self.profiler.dump_stats(self.profile_path)
+        print(f"Profile of generations {self.profile_generations[0]}-{self.profile_generations[1]} "
+              f"saved to '{self.profile_path}'.")
+        self.profiler = None
+
+    def close(self):
+        if self.profiler is not None:
+            self.stop_profiler()
+        if self.metrics_file is not None:
+            self.metrics_file.close()
+            self.metrics_file = None
+
+# Shared disabled instance used as the default hook
+NO_INSTRUMENTATION = Instrumentation()
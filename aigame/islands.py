@@ -0,0 +1,224 @@
+import time
+import traceback
+import multiprocessing
+import numpy as np
+
+from .population import Population
+from .evaluation import PopulationEvaluator
+from .reproduction import reproduce
+from .seeding import make_seeder, initial_population
+from .local_search import LocalSearch, generation_budget
+from .rng import RunRNG
+
+# Island Model: K subpopulations evolve independently in their own processes with the usual
+# evaluate / sort / reproduce loop. Every migration_interval generations each island sends its
+# top agents (genomes and stats only) to the coordinator, which routes them to the target
+# islands over the ring or fully connected topology; they replace the worst agents there.
+
+# Per-generation island summary, same fields as the genetic_algorithm() histories
+HISTORY_KEYS = ('best_fitness', 'avg_fitness', 'worst_fitness', 'unique_positions', 'revisits')
+
+# Islands that receive the emigrants of `island`
+def migration_targets(island, island_count, topology):
+    if topology == 'ring':
+        return [(island + 1) % island_count]
+    if topology == 'full':
+        return [other for other in range(island_count) if other != island]
+    raise ValueError("Invalid MIGRATION_TOPOLOGY. Choose 'ring' or 'full'.")
+
+def _summary(population):
+    best_agent = population[0]
+    return (best_agent.fitness, float(population.fitness.mean()), float(population.fitness[-1]),
+            best_agent.unique_positions, best_agent.revisits)
+
+def _stats(population):
+    return tuple(getattr(population, name).copy() for name in Population.STATS)
+
+# Body of one island process; everything it reports goes through `connection`
+def _run_island(connection, grid_map, rng, population_size, migration_size, config, robust_maps, archived):
+    try:
+        evaluator = PopulationEvaluator(grid_map, backend=config.evaluation_backend,
+                                        cache_size=config.fitness_cache_size,
+                                        checkpoint_interval=config.checkpoint_interval, robust_maps=robust_maps,
+                                        aggregate=config.robust_aggregate, quantile=config.robust_quantile)
+        seeder = make_seeder(grid_map, config, rng)
+        population = initial_population(config, rng, seeder, population_size, archived)
+        local_search = LocalSearch(grid_map, rng.local_search, evaluator.checkpoint_interval) if config.memetic_budget else None
+        migration_interval = config.migration_interval
+        mutation_rate = config.initial_mutation_rate
+        best_fitness_overall = float('-inf')
+        generations_without_improvement = 0
+        summaries = []
+        evaluations = 0
+
+        for generation in range(config.generations):
+            eval_stats = evaluator.evaluate(population)
+            evaluations += len(population)
+            population = population.take(population.fitness_order())
+            if local_search is not None:
+                local_search.improve(population, range(config.elite_size),
+                                     generation_budget(config.memetic_budget, eval_stats))
+                population = population.take(population.fitness_order())
+
+            # Migration: sends the top agents, then replaces the worst agents with the arrivals
+            if migration_interval and generation > 0 and generation % migration_interval == 0:
+                emigrants = population.take(np.arange(migration_size))
+                connection.send(('migrate', summaries, emigrants.genomes, _stats(emigrants)))
+                summaries = []
+                genomes, stats = connection.recv()
+                arrivals = Population(genomes)
+                arrivals.set_stats(slice(None), stats)
+                arrivals = arrivals.take(arrivals.fitness_order()[:population_size - config.elite_size])
+                rows = np.arange(population_size - len(arrivals), population_size)
+                population.copy_rows(rows, arrivals, np.arange(len(arrivals)))
+                population = population.take(population.fitness_order())
+
+            best_fitness = population[0].fitness
+            summaries.append(_summary(population))
+
+            # Same mutation rate schedule as genetic_algorithm(), kept per island
+            if best_fitness > best_fitness_overall:
+                best_fitness_overall = best_fitness
+                generations_without_improvement = 0
+            else:
+                generations_without_improvement += 1
+            if generations_without_improvement >= config.stagnation_threshold:
+                mutation_rate = min(mutation_rate * 1.5, 1.0)
+                generations_without_improvement = 0
+
+            population = reproduce(population, generation, mutation_rate, config, rng=rng, seeder=seeder)
+            mutation_rate = max(config.min_mutation_rate, mutation_rate * 0.99)
+
+        evaluator.close()
+        # After reproduction the elites (with their stats) lead the population
+        best = population.take(np.arange(max(config.elite_size, 1)))
+        connection.send(('done', summaries, best.genomes, _stats(best), evaluations))
+    except Exception:
+        connection.send(('error', traceback.format_exc()))
+    finally:
+        connection.close()
+
+def _receive(connection, island):
+    message = connection.recv()
+    if message[0] == 'error':
+        raise RuntimeError(f"Island {island} failed:\n{message[1]}")
+    return message
+
+# Runs the island model and returns (every island's elites sorted best first, combined history,
+# per-island results). config.population_size is split evenly over config.island_count islands;
+# each island starts from the `archived` warm-start genomes.
+def run_islands(grid_map, config, robust_maps=None, rng=None, archived=None):
+    island_count = config.island_count
+    generations = config.generations
+    topology = config.migration_topology
+    population_size = config.population_size // island_count
+    if config.evaluation_backend == 'parallel':
+        raise ValueError("Islands already run in separate processes; use the 'serial' or 'batch' backend.")
+    # Checkpoints, metrics, profiling and telemetry belong to the single-population generational loop
+    unsupported = [option for option, value in (('RUN_CHECKPOINT_DIR', config.run_checkpoint_dir),
+                                                ('METRICS_PATH', config.metrics_path),
+                                                ('PROFILE_GENERATIONS', config.profile_generations),
+                                                ('TELEMETRY_PORT', config.telemetry_port))
+                   if value is not None]
+    if unsupported:
+        raise ValueError(f"The island model does not support {', '.join(unsupported)}; "
+                         f"use ISLAND_COUNT = 1 or disable {'it' if len(unsupported) == 1 else 'them'}.")
+    if config.memetic_budget and robust_maps is not None:
+        raise ValueError("Memetic local search scores edits on the primary map only; use ROBUST_MAP_COUNT = 1.")
+    if population_size <= config.elite_size:
+        raise ValueError(f"Island population size {population_size} must be larger than "
+                         f"elite_size ({config.elite_size}).")
+    migration_targets(0, island_count, topology)  # Validates the topology before starting processes
+    migration_interval = config.migration_interval
+    migration_size = min(config.migration_size, population_size)
+    # Each island gets its own RunRNG spawned from the run's, so the run is reproducible from its seed
+    island_rngs = (rng or RunRNG()).spawn(island_count)
+
+    start = time.perf_counter()
+    connections, processes = [], []
+    for island in range(island_count):
+        parent_connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_run_island,
+            args=(child_connection, grid_map, island_rngs[island], population_size, migration_size,
+                  config, robust_maps, archived),
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        connections.append(parent_connection)
+        processes.append(process)
+
+    island_histories = [{key: [] for key in HISTORY_KEYS} for _ in range(island_count)]
+
+    def add_summaries(island, summaries):
+        for summary in summaries:
+            for key, value in zip(HISTORY_KEYS, summary):
+                island_histories[island][key].append(value)
+
+    try:
+        migrations = [generation for generation in range(1, generations)
+                      if migration_interval and generation % migration_interval == 0]
+        for generation in migrations:
+            outgoing = []
+            for island, connection in enumerate(connections):
+                _, summaries, genomes, stats = _receive(connection, island)
+                add_summaries(island, summaries)
+                outgoing.append((genomes, stats))
+            for island, connection in enumerate(connections):
+                sources = [source for source in range(island_count)
+                           if island in migration_targets(source, island_count, topology)]
+                genomes = np.concatenate([outgoing[source][0] for source in sources])
+                stats = tuple(np.concatenate([outgoing[source][1][i] for source in sources])
+                              for i in range(len(Population.STATS)))
+                connection.send((genomes, stats))
+            print(f"Generation {generation}, migration ({topology}): " + ", ".join(
+                f"island {island} best {outgoing[island][1][0][0]:.2f}" for island in range(island_count)))
+
+        bests = []
+        evaluations = 0
+        for island, connection in enumerate(connections):
+            _, summaries, genomes, stats, island_evaluations = _receive(connection, island)
+            add_summaries(island, summaries)
+            bests.append((genomes, stats))
+            evaluations += island_evaluations
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+    elapsed = time.perf_counter() - start
+
+    # Elites of all islands, best first
+    best_population = Population(np.concatenate([genomes for genomes, _ in bests]))
+    best_population.set_stats(slice(None), [np.concatenate([stats[i] for _, stats in bests])
+                                            for i in range(len(Population.STATS))])
+    order = best_population.fitness_order()
+    best_island = int(order[0]) // len(bests[0][0])
+
+    # Combined history: best/worst over islands, average of the island averages
+    history = {
+        'best_fitness': [max(values) for values in zip(*(h['best_fitness'] for h in island_histories))],
+        'avg_fitness': [float(np.mean(values)) for values in zip(*(h['avg_fitness'] for h in island_histories))],
+        'worst_fitness': [min(values) for values in zip(*(h['worst_fitness'] for h in island_histories))],
+    }
+    leaders = [max(range(island_count), key=lambda island: island_histories[island]['best_fitness'][generation])
+               for generation in range(generations)]
+    history['unique_positions'] = [island_histories[island]['unique_positions'][generation]
+                                   for generation, island in enumerate(leaders)]
+    history['revisits'] = [island_histories[island]['revisits'][generation]
+                           for generation, island in enumerate(leaders)]
+
+    print(f"\nIsland model: {island_count} islands x {population_size} agents, {generations} generations "
+          f"in {elapsed:.2f}s ({evaluations / elapsed:.1f} evaluations/s)")
+    for island, island_history in enumerate(island_histories):
+        print(f"Island {island}: Best fitness: {island_history['best_fitness'][-1]:.2f}, "
+              f"Average fitness: {island_history['avg_fitness'][-1]:.2f}")
+
+    island_results = {
+        'histories': island_histories,
+        'best_island': best_island,
+        'seconds': elapsed,
+        'evaluations_per_second': evaluations / elapsed,
+    }
+    return best_population.take(order), history, island_results
@@ -0,0 +1,139 @@
+import time
+
+from .game_simulation import GameSimulation, SnapshotCodec
+
+# Memetic Local Search: hill-climbs the elites of each generation with small edits (a single-gene
+# flip, a reversed segment, two swapped genes) and keeps every edit that raises the fitness.
+# Genes before an edit play exactly as before, so a candidate restores the elite's game state from
+# a per-gene snapshot taken just before the edit and only simulates from there to the game's end.
+# Edits past the elite's effective length are dead and never tried. Every gene the stage plays
+# (replaying the elites, scoring candidates, replaying accepted edits) is charged to a budget
+# sized from the genes the generation's evaluation played, so the stage costs a fixed fraction
+# of the evaluation whatever the genomes' lengths.
+
+MOVES = ('flip', 'reverse', 'swap')
+MAX_SEGMENT = 8  # Longest reversed segment / farthest swap partner, in genes
+# Budget charged on top of the simulated genes, in genes (measured against GameSimulation.step)
+SNAPSHOT_COST = 1  # Per snapshot taken while playing an elite or an accepted edit
+CANDIDATE_COST = 20  # Per candidate proposed (random draws, copying and editing the genome)
+# Budget share of a climbed elite, as multiples of the cost of replaying it: the share aimed for
+# when the budget is small, and the least one worth replaying the elite for
+TARGET_SEARCH_SHARE = 4
+MIN_SEARCH_SHARE = 2
+
+# Genes of local search for one generation: `fraction` of the genes its evaluation played, whether
+# simulated, resumed from a snapshot or shared by a prefix, so every backend and checkpoint
+# setting gives the same budget and the same run
+def generation_budget(fraction, eval_stats):
+    played = (eval_stats.get('steps_executed', 0) + eval_stats.get('steps_resumed', 0)
+              + eval_stats.get('steps_deduplicated', 0))
+    return int(fraction * played)
+
+class LocalSearch:
+    def __init__(self, grid_map, rng, checkpoint_interval=0):
+        self.game_sim = GameSimulation(grid_map=grid_map)
+        self.snapshot_codec = SnapshotCodec(grid_map)
+        self.rng = rng
+        self.checkpoint_interval = checkpoint_interval  # Matches the evaluator's, so children can resume from improved elites
+
+    # Plays `genome` from the snapshot before gene `start`; returns the snapshots before every gene
+    # from `start` up to the end of the game (the last one is the final state)
+    def play(self, genome, start=0, snapshots=None):
+        game = self.game_sim
+        if start == 0:
+            game.reset()
+        else:
+            game.restore(snapshots[start])
+        played = [game.snapshot(start)]
+        for step in range(start, len(genome)):
+            if game.finished():
+                break
+            game.step(genome[step])
+            played.append(game.snapshot(step + 1))
+        return played
+
+    # Fitness of `genome` after replaying from gene `start`, and the genes simulated for it
+    def score(self, genome, start, snapshot):
+        game = self.game_sim
+        game.restore(snapshot)
+        step = start
+        while step < len(genome) and not game.finished():
+            game.step(genome[step])
+            step += 1
+        return game.calculate_fitness(), step - start
+
+    # A random edit of the first `live` genes: (first changed gene, edited genome)
+    def propose(self, genome, live):
+        rng = self.rng
+        move = MOVES[rng.integers(len(MOVES))]
+        start = int(rng.integers(live))
+        candidate = list(genome)
+        end = min(len(genome), start + MAX_SEGMENT)
+        if move == 'flip':
+            candidate[start] = (candidate[start] + int(rng.integers(1, 4))) % 4
+        elif move == 'reverse':
+            end = int(rng.integers(start + 2, end + 1)) if end >= start + 2 else start
+            candidate[start:end] = candidate[start:end][::-1]
+        else:
+            other = int(rng.integers(start + 1, end)) if end > start + 1 else start
+            candidate[start], candidate[other] = candidate[other], candidate[start]
+        return start, candidate
+
+    # Hill-climbs population rows (sorted best first) within a budget of simulated genes, writing
+    # improvements back into the population; returns the per-generation statistics
+    def improve(self, population, rows, budget):
+        began = time.perf_counter()
+        stats = {'candidates': 0, 'accepted': 0, 'steps': 0, 'fitness_gain': 0.0}
+        spent = 0.0  # Genes simulated plus the snapshot and candidate overheads
+        rows = list(rows)
+        for number, row in enumerate(rows):
+            # Unspent budget carries over; a small budget goes to the best elites rather than being
+            # spread so thin that replaying each elite uses up its share
+            replay_cost = population.effective_length[row] * (1 + SNAPSHOT_COST)
+            row_budget = min(max((budget - spent) / (len(rows) - number), TARGET_SEARCH_SHARE * replay_cost),
+                             budget - spent)
+            if row_budget < MIN_SEARCH_SHARE * replay_cost:
+                break
+            row_end = spent + row_budget
+            genome = population.genomes[row].tolist()
+            snapshots = self.play(genome)
+            spent += (len(snapshots) - 1) * (1 + SNAPSHOT_COST)
+            stats['steps'] += len(snapshots) - 1
+            fitness = self.game_sim.calculate_fitness()
+            initial_fitness = fitness
+            while spent < row_end:
+                live = len(snapshots) - 1  # Genes played before the game ended
+                if live == 0:
+                    break
+                start, candidate = self.propose(genome, live)
+                spent += CANDIDATE_COST
+                if candidate[start:start + MAX_SEGMENT] == genome[start:start + MAX_SEGMENT]:
+                    continue  # Every edit lies within MAX_SEGMENT genes of its start
+                candidate_fitness, steps = self.score(candidate, start, snapshots[start])
+                spent += steps
+                stats['steps'] += steps
+                stats['candidates'] += 1
+                if candidate_fitness > fitness:
+                    genome, fitness = candidate, candidate_fitness
+                    played = self.play(genome, start, snapshots)
+                    snapshots = snapshots[:start] + played
+                    spent += (len(played) - 1) * (1 + SNAPSHOT_COST)
+                    stats['steps'] += len(played) - 1
+                    stats['accepted'] += 1
+            if fitness > initial_fitness:
+                stats['fitness_gain'] += fitness - initial_fitness
+                self.write_back(population, row, genome, snapshots)
+        stats['seconds'] = time.perf_counter() - began
+        return stats
+
+    # Stores an improved genome with its stats and evaluator snapshots in the population row
+    def write_back(self, population, row, genome, snapshots):
+        self.game_sim.restore(snapshots[-1])
+        population.genomes[row] = genome
+        self.game_sim.write_results(population[row])
+        if self.checkpoint_interval:
+            # Same snapshots GameSimulation.simulate() keeps: every checkpoint_interval genes before the game ended
+            population.checkpoints[row] = self.snapshot_codec.pack(
+                snapshot for snapshot in snapshots[1:-1] if snapshot[0] % self.checkpoint_interval == 0)
+        else:
+            population.checkpoints[row] = None
@@ -1,22 +1,93 @@
-import random
+import numpy as np
 
-from .constants import GENOME_LENGTH
+from .rng import DEFAULT_RNG
+
+# Operators work on genome rows (NumPy arrays or lists) and return new genomes.
+# With report_span=True they also return the (start, end) index span they may have changed,
+# (len(genome), 0) when nothing was touched. Random numbers come from the given Generator
+# (the run's crossover / mutation stream).
 
 # Crossover Operators: Corssover between two genomes
-def two_point_crossover(genome1, genome2):
-    if GENOME_LENGTH < 3:
+def two_point_crossover(genome1, genome2, report_span=False, rng=DEFAULT_RNG.crossover):
+    genome_length = len(genome1)
+    if genome_length < 3:
         # Ensure there are at least two crossover points
-        return genome1.copy()
-    point1 = random.randint(1, GENOME_LENGTH - 2)
-    point2 = random.randint(point1 + 1, GENOME_LENGTH - 1)
-    child_genome = genome1[:point1] + genome2[point1:point2] + genome1[point2:]
-    return child_genome
-
-# Mutation Operators: swaps two genes within probability
-def swap_mutation(genome, mutation_rate):
+        child_genome = genome1.copy()
+        return (child_genome, (genome_length, 0)) if report_span else child_genome
+    # point1 in [1, L-2], point2 in [point1+1, L-1] from one bulk draw
+    draw1, draw2 = rng.random(2).tolist()
+    point1 = 1 + int(draw1 * (genome_length - 2))
+    point2 = point1 + 1 + int(draw2 * (genome_length - 1 - point1))
+    child_genome = genome1.copy()
+    child_genome[point1:point2] = genome2[point1:point2]
+    return (child_genome, (point1, point2)) if report_span else child_genome
+
+# Mutation Operators: swaps two genes within probability.
+# live_length limits mutation to the first live_length genes (the ones the parent executed).
+def swap_mutation(genome, mutation_rate, report_span=False, rng=DEFAULT_RNG.mutation, live_length=None):
     genome = genome.copy()  # To avoid modifying the original genome
-    for i in range(len(genome)):
-        if random.random() < mutation_rate:
-            swap_idx = random.randint(0, len(genome) - 1)
-            genome[i], genome[swap_idx] = genome[swap_idx], genome[i]
-    return genome
\ No newline at end of file
+    start, end = len(genome), 0
+    region = len(genome) if live_length is None else max(1, min(live_length, len(genome)))
+    # All coin flips and swap partners drawn at once; the swaps themselves still run in gene order
+    positions = np.flatnonzero(rng.random(region) < mutation_rate)
+    swap_indices = rng.integers(0, region, size=len(positions))
+    for i, swap_idx in zip(positions.tolist(), swap_indices.tolist()):
+        genome[i], genome[swap_idx] = genome[swap_idx], genome[i]
+        start = min(start, i, swap_idx)
+        end = max(end, i + 1, swap_idx + 1)
+    return (genome, (start, end)) if report_span else genome
+
+# Batched operators: whole offspring matrix at once, returning per-row (starts, ends) spans
+
+def batch_two_point_crossover(genomes1, genomes2, rng=DEFAULT_RNG.crossover):
+    num_children, genome_length = genomes1.shape
+    if genome_length < 3:
+        return genomes1.copy(), (np.full(num_children, genome_length), np.zeros(num_children, dtype=np.int64))
+    # Same point distribution as two_point_crossover: point1 in [1, L-2], point2 in [point1+1, L-1]
+    points1 = rng.integers(1, genome_length - 1, size=num_children)
+    points2 = points1 + 1 + (rng.random(num_children) * (genome_length - 1 - points1)).astype(np.int64)
+    columns = np.arange(genome_length)
+    from_parent2 = (columns >= points1[:, None]) & (columns < points2[:, None])
+    return np.where(from_parent2, genomes2, genomes1), (points1, points2)
+
+def batch_swap_mutation(genomes, mutation_rate, rng=DEFAULT_RNG.mutation, live_lengths=None):
+    genomes = genomes.copy()
+    num_children, genome_length = genomes.shape
+    starts = np.full(num_children, genome_length, dtype=np.int64)
+    ends = np.zeros(num_children, dtype=np.int64)
+    if mutation_rate <= 0 or genomes.size == 0:
+        return genomes, (starts, ends)
+
+    # Mutated positions as a Bernoulli process over the flattened matrix: geometric gaps
+    # avoid drawing one random number per gene
+    expected = genomes.size * mutation_rate
+    gaps = rng.geometric(min(mutation_rate, 1.0), size=int(expected + 6 * np.sqrt(expected) + 16))
+    positions = np.cumsum(gaps) - 1
+    while positions[-1] < genomes.size:
+        more = rng.geometric(min(mutation_rate, 1.0), size=len(gaps))
+        positions = np.concatenate((positions, positions[-1] + np.cumsum(more)))
+    positions = positions[positions < genomes.size]
+    rows = positions // genome_length
+    columns = positions % genome_length
+    if live_lengths is None:
+        swap_columns = rng.integers(0, genome_length, size=len(positions))
+    else:
+        # Live-region mutation: only each row's first live_lengths[row] genes mutate, among themselves
+        live_lengths = np.clip(live_lengths, 1, genome_length)
+        inside = columns < live_lengths[rows]
+        rows, columns = rows[inside], columns[inside]
+        swap_columns = rng.integers(0, live_lengths[rows])
+
+    np.minimum.at(starts, rows, np.minimum(columns, swap_columns))
+    np.maximum.at(ends, rows, np.maximum(columns, swap_columns) + 1)
+
+    # Swaps run in gene order like swap_mutation; rows within one column are independent
+    order = np.argsort(columns, kind='stable')
+    rows, columns, swap_columns = rows[order], columns[order], swap_columns[order]
+    boundaries = np.flatnonzero(np.diff(columns)) + 1
+    for group in np.split(np.arange(len(rows)), boundaries):
+        group_rows, column, group_swaps = rows[group], columns[group[0]], swap_columns[group]
+        genes = genomes[group_rows, column]
+        genomes[group_rows, column] = genomes[group_rows, group_swaps]
+        genomes[group_rows, group_swaps] = genes
+    return genomes, (starts, ends)
@@ -0,0 +1,83 @@
+import numpy as np
+
+from .constants import GENOME_LENGTH
+from .agent import Agent
+from .rng import DEFAULT_RNG
+
+# Population: structure-of-arrays container for a whole generation.
+# Genomes live in one contiguous uint8 matrix, fitness and stats in parallel arrays.
+class Population:
+    # Per-agent results written by evaluation, in the order stored by the fitness cache
+    STATS = ('fitness', 'items_collected', 'total_movement_cost', 'unique_positions', 'revisits', 'effective_length')
+
+    def __init__(self, genomes):
+        self.genomes = np.ascontiguousarray(genomes, dtype=np.uint8)
+        size = len(self.genomes)
+        self.fitness = np.full(size, np.nan)  # NaN until evaluated
+        self.items_collected = np.zeros(size, dtype=np.int32)
+        self.total_movement_cost = np.zeros(size, dtype=np.int32)
+        self.unique_positions = np.zeros(size, dtype=np.int32)
+        self.revisits = np.zeros(size, dtype=np.int32)
+        self.effective_length = np.zeros(size, dtype=np.int32)  # Genes executed before the game ended
+
+        # Incremental evaluation: each row's own simulation snapshots (one packed bytes blob per row),
+        # and for children the parent's snapshots plus the first gene index that differs from that parent
+        self.checkpoints = [None] * size
+        self.parent_checkpoints = [None] * size
+        self.first_changed = np.zeros(size, dtype=np.int64)
+        # Dead-gene skipping: children that play exactly their parent's game and inherited its stats
+        self.stats_inherited = np.zeros(size, dtype=bool)
+
+    # Population with uniformly random genomes
+    @classmethod
+    def random(cls, size, genome_length=GENOME_LENGTH, rng=DEFAULT_RNG.initialization):
+        return cls(rng.integers(0, 4, size=(size, genome_length), dtype=np.uint8))
+
+    @classmethod
+    def empty(cls, size, genome_length=GENOME_LENGTH):
+        return cls(np.zeros((size, genome_length), dtype=np.uint8))
+
+    @property
+    def genome_length(self):
+        return self.genomes.shape[1]
+
+    def __len__(self):
+        return len(self.genomes)
+
+    # Agents are lightweight views onto a row
+    def __getitem__(self, index):
+        return Agent(population=self, index=index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Agent(population=self, index=index)
+
+    # New population holding the given rows (genomes and stats), in the given order
+    def take(self, rows):
+        taken = Population(self.genomes[rows])
+        for name in self.STATS:
+            getattr(taken, name)[:] = getattr(self, name)[rows]
+        taken.checkpoints = [self.checkpoints[row] for row in np.asarray(rows).tolist()]
+        return taken
+
+    # Copies genomes and stats of source_rows in source into rows of this population
+    def copy_rows(self, rows, source, source_rows):
+        self.genomes[rows] = source.genomes[source_rows]
+        self.copy_stats(rows, source, source_rows)
+        for row, source_row in zip(np.asarray(rows).tolist(), np.asarray(source_rows).tolist()):
+            self.checkpoints[row] = source.checkpoints[source_row]
+
+    def copy_stats(self, rows, source, source_rows):
+        for name in self.STATS:
+            getattr(self, name)[rows] = getattr(source, name)[source_rows]
+
+    # Indices that sort the population by fitness, best first (stable, like list.sort)
+    def fitness_order(self):
+        return np.argsort(-self.fitness, kind='stable')
+
+    def get_stats(self, index):
+        return tuple(getattr(self, name)[index].item() for name in self.STATS)
+
+    def set_stats(self, rows, stats):
+        for name, values in zip(self.STATS, stats):
+            getattr(self, name)[rows] = values
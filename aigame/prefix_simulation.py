@@ -0,0 +1,75 @@
+import numpy as np
+
+from .game_simulation import GameSimulation
+
+# Prefix Simulation: genomes of a converged population share long prefixes, so each distinct
+# prefix is simulated once. Genomes are sorted lexicographically (a flattened prefix trie);
+# each one resumes from the snapshot where it diverges from the genomes before it, and takes
+# snapshots at the depths where later genomes will diverge from it.
+class PrefixSimulation:
+    def __init__(self, grid_map):
+        self.game_sim = GameSimulation(grid_map=grid_map)
+        self.steps_played = 0
+        self.steps_equivalent = 0
+
+    # Simulates the given rows of the population and writes their results back into it
+    def simulate(self, population, rows):
+        self.steps_played = 0  # Genes actually played
+        self.steps_equivalent = 0  # Genes per-agent simulation would have played
+        if len(rows) == 0:
+            return
+        genomes = np.ascontiguousarray(population.genomes[rows])
+        num_genomes, genome_length = genomes.shape
+
+        # Lexicographic order; common[i] is the prefix length shared with the previous sorted genome
+        order = np.argsort(genomes.view(np.dtype((np.void, genome_length))).ravel(), kind='stable')
+        genomes = genomes[order]
+        common = np.zeros(num_genomes, dtype=np.int64)
+        if num_genomes > 1:
+            differs = genomes[1:] != genomes[:-1]
+            common[1:] = np.where(differs.any(axis=1), differs.argmax(axis=1), genome_length)
+        common = common.tolist()
+
+        # Next later genome sharing a strictly shorter prefix; following this chain from i + 1 gives
+        # the depths at which all later genomes branch off genome i's path
+        next_shorter = [num_genomes] * num_genomes
+        pending = []
+        for i in range(num_genomes - 1, 0, -1):
+            while pending and common[pending[-1]] >= common[i]:
+                pending.pop()
+            next_shorter[i] = pending[-1] if pending else num_genomes
+            pending.append(i)
+
+        game = self.game_sim
+        game.reset()
+        # Snapshots along the current path: (depth, snapshot, genes played to reach it)
+        stack = [(0, game.snapshot(0), 0)]
+        for i in range(num_genomes):
+            while stack[-1][0] > common[i]:
+                stack.pop()
+            depth, snapshot, played_before = stack[-1]
+            game.restore(snapshot)
+
+            branch_depths = []
+            j = i + 1
+            while j < num_genomes and common[j] > depth:
+                branch_depths.append(common[j])
+                j = next_shorter[j]
+
+            genome = genomes[i].tolist()
+            step, played = depth, played_before
+            for target in reversed(branch_depths):
+                while step < target and not game.finished():
+                    game.step(genome[step])
+                    played += 1
+                    step += 1
+                step = target  # A finished game's state holds for every deeper prefix
+                stack.append((target, game.snapshot(target), played))
+            while step < genome_length and not game.finished():
+                game.step(genome[step])
+                played += 1
+                step += 1
+
+            self.steps_played += played - played_before
+            self.steps_equivalent += played
+            game.write_results(population[int(rows[order[i]])])
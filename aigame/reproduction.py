@@ -0,0 +1,120 @@
+import numpy as np
+
+from .config import DEFAULT_CONFIG
+from .population import Population
+from .instrumentation import NO_INSTRUMENTATION
+from .rng import DEFAULT_RNG
+from .selection import (
+    adaptive_tournament_selection,
+    rank_based_selection,
+    batch_tournament_selection,
+    batch_rank_based_selection,
+)
+from .operators import two_point_crossover, swap_mutation, batch_two_point_crossover, batch_swap_mutation
+from .seeding import seeded_count
+
+# Reproduction: builds the next generation from a population sorted best first.
+# Layout: elites, then children, then random immigrants. `rng` is the run's RunRNG; with a tour
+# `seeder` (heuristic initialization) part of the immigrants are mutated tours instead.
+def reproduce(population, generation, mutation_rate, config=DEFAULT_CONFIG, instrumentation=NO_INSTRUMENTATION,
+              rng=DEFAULT_RNG, seeder=None):
+    population_size = len(population)
+    genome_length = population.genome_length
+    elite_size = config.elite_size
+    num_immigrants = int(config.immigration_rate * population_size)
+    num_children = population_size - elite_size - num_immigrants
+    children = np.arange(elite_size, elite_size + num_children)
+
+    with instrumentation.phase('elitism'):
+        next_generation = Population.empty(population_size, genome_length)
+        elites = np.arange(elite_size)
+        next_generation.copy_rows(elites, population, elites)  # Elitism: retain top agents
+
+    if config.mutation_region not in ('genome', 'live'):
+        raise ValueError("Invalid MUTATION_REGION. Choose 'genome' or 'live'.")
+    if config.reproduction_mode == 'batch':
+        parents1, first_changed = batch_reproduce(
+            population, next_generation, children, generation, mutation_rate, config, instrumentation, rng
+        )
+    elif config.reproduction_mode == 'per_child':
+        parents1, first_changed = per_child_reproduce(
+            population, next_generation, children, generation, mutation_rate, config, instrumentation, rng
+        )
+    else:
+        raise ValueError("Invalid REPRODUCTION_MODE. Choose 'batch' or 'per_child'.")
+
+    # Child matches parent1 up to the first changed gene, so it can resume from parent1's snapshots
+    next_generation.first_changed[children] = first_changed
+    for child_index, parent1 in zip(children.tolist(), parents1.tolist()):
+        next_generation.parent_checkpoints[child_index] = population.checkpoints[parent1]
+
+    # Dead-gene skipping: a child whose changes all lie after the last gene parent1 executed plays
+    # exactly parent1's game, so it inherits parent1's stats and is not simulated
+    if config.dead_gene_skipping:
+        dead = first_changed >= population.effective_length[parents1]
+        next_generation.copy_stats(children[dead], population, parents1[dead])
+        next_generation.stats_inherited[children[dead]] = True
+
+    # Introduces random immigrants to maintain diversity
+    with instrumentation.phase('immigration'):
+        immigrants = Population.random(num_immigrants, genome_length, rng.immigration)
+        seeded = seeded_count(config, num_immigrants, seeder)
+        if seeded:
+            immigrants.genomes[:seeded] = seeder.genomes(seeded, mutation_rate)
+        next_generation.genomes[elite_size + num_children:] = immigrants.genomes
+
+    return next_generation
+
+# One child at a time with the per-genome selection and operators
+def per_child_reproduce(population, next_generation, children, generation, mutation_rate, config, instrumentation,
+                        rng):
+    parents1 = np.empty(len(children), dtype=np.int64)
+    first_changed = np.empty(len(children), dtype=np.int64)
+    for i, child_index in enumerate(children):
+        with instrumentation.phase('selection'):
+            if config.selection_method == 'adaptive_tournament':
+                parent1 = adaptive_tournament_selection(population, generation, config, rng.selection)
+                parent2 = adaptive_tournament_selection(population, generation, config, rng.selection)
+            elif config.selection_method == 'rank_based':
+                parent1 = rank_based_selection(population, rng.selection)
+                parent2 = rank_based_selection(population, rng.selection)
+            else:
+                raise ValueError("Invalid SELECTION_METHOD. Choose 'adaptive_tournament' or 'rank_based'.")
+
+        with instrumentation.phase('crossover_mutation'):
+            # Performs two-point crossover
+            child_genome, (crossover_start, _) = two_point_crossover(
+                population.genomes[parent1], population.genomes[parent2], report_span=True, rng=rng.crossover
+            )
+            # Performs swap mutation and writes the child into the next generation
+            live_length = population.effective_length[parent1] if config.mutation_region == 'live' else None
+            child_genome, (mutation_start, _) = swap_mutation(
+                child_genome, mutation_rate, report_span=True, rng=rng.mutation, live_length=live_length
+            )
+            next_generation.genomes[child_index] = child_genome
+
+        parents1[i] = parent1
+        first_changed[i] = min(crossover_start, mutation_start)
+    return parents1, first_changed
+
+# Whole brood at once: all parents drawn from the fitness array, crossover and mutation on the offspring matrix
+def batch_reproduce(population, next_generation, children, generation, mutation_rate, config, instrumentation, rng):
+    num_children = len(children)
+    with instrumentation.phase('selection'):
+        if config.selection_method == 'adaptive_tournament':
+            parents = batch_tournament_selection(population.fitness, 2 * num_children, generation, config,
+                                                 rng.selection)
+        elif config.selection_method == 'rank_based':
+            parents = batch_rank_based_selection(population.fitness, 2 * num_children, rng.selection)
+        else:
+            raise ValueError("Invalid SELECTION_METHOD. Choose 'adaptive_tournament' or 'rank_based'.")
+        parents1, parents2 = parents[:num_children], parents[num_children:]
+
+    with instrumentation.phase('crossover_mutation'):
+        offspring, (crossover_starts, _) = batch_two_point_crossover(
+            population.genomes[parents1], population.genomes[parents2], rng.crossover
+        )
+        live_lengths = population.effective_length[parents1] if config.mutation_region == 'live' else None
+        offspring, (mutation_starts, _) = batch_swap_mutation(offspring, mutation_rate, rng.mutation, live_lengths)
+        next_generation.genomes[children] = offspring
+    return parents1, np.minimum(crossover_starts, mutation_starts)
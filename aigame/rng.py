@@ -0,0 +1,46 @@
+import numpy as np
+
+# Run RNG: one independent NumPy Generator stream per subsystem, all spawned from one run seed.
+# A subsystem drawing more or fewer numbers (e.g. another selection method) leaves the other
+# streams untouched, and nothing depends on the global `random` / `np.random` state, so a run
+# is reproducible from its seed whatever backend evaluates it.
+STREAMS = ('initialization', 'selection', 'crossover', 'mutation', 'immigration', 'seeding', 'local_search')
+# Spawn keys: the first BASE_STREAMS streams take keys 0-4 and child RNGs follow from key 5, as when
+# those were the only streams. Streams added later take keys from ADDED_STREAM_KEY on, so adding
+# one reseeds neither the existing streams nor the children (e.g. islands).
+BASE_STREAMS = 5
+ADDED_STREAM_KEY = 1 << 20
+
+class RunRNG:
+    def __init__(self, seed=None):
+        # seed: int, None (fresh OS entropy) or a SeedSequence spawned by a parent RunRNG
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        for index, name in enumerate(STREAMS):
+            key = index if index < BASE_STREAMS else ADDED_STREAM_KEY + index - BASE_STREAMS
+            setattr(self, name, np.random.Generator(np.random.PCG64(self._child_sequence(key))))
+
+    # Root entropy of the run: RunRNG(rng.entropy) replays a run started with seed=None
+    @property
+    def entropy(self):
+        return self.seed_sequence.entropy
+
+    # SeedSequence with spawn key `key` under this RNG's own (what SeedSequence.spawn() numbers 0, 1, ...)
+    def _child_sequence(self, key):
+        parent = self.seed_sequence
+        return np.random.SeedSequence(parent.entropy, spawn_key=parent.spawn_key + (key,), pool_size=parent.pool_size)
+
+    # Independent child RNGs, e.g. one per island (the same ones on every call)
+    def spawn(self, count):
+        return [RunRNG(self._child_sequence(BASE_STREAMS + child)) for child in range(count)]
+
+    # Bit generator states of all streams as plain JSON-serialisable dicts (for run checkpoints)
+    def get_state(self):
+        return {name: getattr(self, name).bit_generator.state for name in STREAMS}
+
+    def set_state(self, state):
+        for name in STREAMS:
+            if name in state:  # Checkpoints written before a stream existed leave it at its seeded state
+                getattr(self, name).bit_generator.state = state[name]
+
+# Streams used when no run RNG is passed (benchmarks, standalone Agent() and operator calls)
+DEFAULT_RNG = RunRNG()
@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+import numpy as np
+
+from .population import Population
+from .genome_packing import pack_genomes, unpack_genomes, packed_length
+
+# Run Checkpoints: the evaluated, sorted population of a generation plus everything the GA loop
+# needs to continue from it (mutation rate, stagnation counter, histories, RNG stream states).
+# Layout of a checkpoint directory:
+#   generation_XXXXX/genomes.u2   2-bit packed genomes, memory-mappable (population_size x ceil(L/4) bytes)
+#   generation_XXXXX/arrays.npz   fitness, agent stats and histories (no pickled objects)
+#   generation_XXXXX/state.json   scalars: generation, shapes, run entropy and shape, mutation rate, counters, RNG stream states
+#   LATEST                        name of the last complete generation_XXXXX directory
+# A checkpoint only becomes visible once LATEST is atomically replaced, so a crash while
+# writing leaves the previous checkpoint intact. A checkpoint also records the run's root entropy
+# (so a run started with run_seed=None resumes with the same seeds) and the config fields that
+# define the run's shape; resuming with a different shape is rejected.
+
+LATEST_FILE = 'LATEST'
+KEEP_CHECKPOINTS = 2  # Complete checkpoints kept on disk, older ones are removed
+# Config fields a checkpointed population and its RNG streams only make sense with
+RUN_SHAPE_FIELDS = ('population_size', 'genome_length', 'map_seed', 'grid_width', 'grid_height',
+                    'robust_map_count', 'initialization')
+
+def run_shape(config):
+    return {field: getattr(config, field) for field in RUN_SHAPE_FIELDS}
+
+def _write_file(path, write):
+    with open(path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+
+def save_run_checkpoint(directory, generation, population, mutation_rate,
+                        generations_without_improvement, best_fitness_overall, history, rng, config):
+    os.makedirs(directory, exist_ok=True)
+    name = f'generation_{generation:05d}'
+    path = os.path.join(directory, name)
+    if os.path.exists(path):
+        shutil.rmtree(path)  # Leftover of an interrupted write
+    os.makedirs(path)
+
+    _write_file(os.path.join(path, 'genomes.u2'), lambda f: f.write(pack_genomes(population.genomes).tobytes()))
+
+    arrays = {stat: getattr(population, stat) for stat in Population.STATS}
+    arrays.update({'history_' + key: np.asarray(values) for key, values in history.items()})
+    _write_file(os.path.join(path, 'arrays.npz'), lambda f: np.savez(f, **arrays))
+
+    state = {
+        'generation': generation,
+        'population_size': len(population),
+        'genome_length': population.genome_length,
+        'mutation_rate': mutation_rate,
+        'generations_without_improvement': generations_without_improvement,
+        'best_fitness_overall': best_fitness_overall,
+        'history_keys': list(history),
+        'entropy': str(rng.entropy),  # 128-bit for fresh OS entropy, kept as a string
+        'run': run_shape(config),
+        'rng_state': rng.get_state(),  # PCG64 states are plain (arbitrary-size) integers
+    }
+    _write_file(os.path.join(path, 'state.json'), lambda f: f.write(json.dumps(state, indent=2).encode()))
+
+    # Commits the checkpoint, then drops the oldest ones
+    latest_tmp = os.path.join(directory, LATEST_FILE + '.tmp')
+    _write_file(latest_tmp, lambda f: f.write(name.encode()))
+    os.replace(latest_tmp, os.path.join(directory, LATEST_FILE))
+    checkpoints = sorted(entry for entry in os.listdir(directory) if entry.startswith('generation_'))
+    keep = checkpoints[:checkpoints.index(name) + 1][-KEEP_CHECKPOINTS:]
+    for old in checkpoints:
+        if old not in keep:
+            shutil.rmtree(os.path.join(directory, old))
+    return path
+
+# Memory-maps the packed genome file of a checkpoint without reading it into memory
+def open_packed_genomes(path, population_size, genome_length):
+    return np.memmap(os.path.join(path, 'genomes.u2'), dtype=np.uint8, mode='r',
+                     shape=(population_size, packed_length(genome_length)))
+
+# Loads the latest complete checkpoint; returns None if there is none. The caller seeds the run's
+# RunRNG with 'entropy' and restores it from 'rng_state'. Raises ValueError if the checkpoint was
+# written by a run of a different shape or seed than `config`.
+def load_run_checkpoint(directory, config):
+    latest = os.path.join(directory, LATEST_FILE)
+    if not os.path.exists(latest):
+        return None
+    with open(latest) as f:
+        path = os.path.join(directory, f.read().strip())
+    with open(os.path.join(path, 'state.json')) as f:
+        state = json.load(f)
+    check_run(state, config, path)
+
+    packed = open_packed_genomes(path, state['population_size'], state['genome_length'])
+    population = Population(unpack_genomes(packed, state['genome_length']))
+    with np.load(os.path.join(path, 'arrays.npz'), allow_pickle=False) as arrays:
+        population.set_stats(slice(None), [arrays[name] for name in Population.STATS])
+        history = {key: arrays['history_' + key].tolist() for key in state['history_keys']}
+
+    return {
+        'generation': state['generation'],
+        'population': population,
+        'mutation_rate': state['mutation_rate'],
+        'generations_without_improvement': state['generations_without_improvement'],
+        'best_fitness_overall': state['best_fitness_overall'],
+        'history': history,
+        'entropy': int(state['entropy']) if 'entropy' in state else config.run_seed,
+        'rng_state': state['rng_state'],
+    }
+
+# Rejects resuming a checkpoint under a config whose run shape or run_seed differs from its run
+def check_run(state, config, path):
+    saved = state.get('run', {})  # Checkpoints written before the run shape was recorded are not checked
+    mismatched = [f"{field}={saved[field]!r} (config: {value!r})"
+                  for field, value in run_shape(config).items() if field in saved and saved[field] != value]
+    if 'entropy' in state and config.run_seed is not None and int(state['entropy']) != config.run_seed:
+        mismatched.append(f"run_seed={state['entropy']} (config: {config.run_seed})")
+    if mismatched:
+        raise ValueError(f"Run checkpoint '{path}' belongs to a different run: " + ', '.join(mismatched) +
+                         ". Resume with the same settings or use another RUN_CHECKPOINT_DIR.")
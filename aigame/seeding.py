@@ -0,0 +1,156 @@
+import heapq
+import itertools
+from collections import deque
+
+from .population import Population
+from .operators import batch_swap_mutation
+
+# Heuristic Seeding: instead of starting from uniformly random genomes, part of the initial
+# population (and of each generation's immigrants) encodes a cheap tour of the items.
+# Dijkstra over the terrain costs gives the cheapest paths between the start tile and the items,
+# the cheapest item order is picked over all permutations, and the rest of the genome explores
+# adjacent unvisited normal tiles before parking against the map edge, where moves cost nothing.
+# A pool of tour variants (randomly perturbed terrain costs, random exploration choices) is built
+# once; seeded genomes are pool variants with swap mutation on top.
+
+MAX_DETOUR = 2  # Visited tiles the exploration walk may cross to reach the next unvisited normal tile
+SCORE_MARGIN = 10  # Exploration stops before the movement cost would bring the score this close to 0
+EXACT_ORDER_ITEMS = 7  # Item orders are searched exhaustively up to this many items, greedily beyond
+
+# Dijkstra from `source` where entering a cell costs cell_costs[cell]; returns (distances, predecessors)
+def shortest_paths(grid_map, source, cell_costs):
+    distances = [float('inf')] * grid_map.num_cells
+    predecessors = [-1] * grid_map.num_cells
+    distances[source] = 0
+    queue = [(0, source)]
+    while queue:
+        distance, cell = heapq.heappop(queue)
+        if distance > distances[cell]:
+            continue
+        for next_cell in grid_map.transitions[cell]:
+            if next_cell >= 0 and distance + cell_costs[next_cell] < distances[next_cell]:
+                distances[next_cell] = distance + cell_costs[next_cell]
+                predecessors[next_cell] = cell
+                heapq.heappush(queue, (distances[next_cell], next_cell))
+    return distances, predecessors
+
+# Cells from source (exclusive) to target (inclusive) along the predecessor tree
+def path_to(predecessors, source, target):
+    path = []
+    while target != source:
+        path.append(target)
+        target = predecessors[target]
+    return path[::-1]
+
+# Actions that walk the given cell path from `start`
+def path_actions(grid_map, start, path):
+    actions = []
+    for cell in path:
+        actions.append(grid_map.transitions[start].index(cell))
+        start = cell
+    return actions
+
+# Cheapest visiting order of the targets given pairwise distances (index 0 is the start)
+def best_order(distances, count):
+    targets = range(1, count + 1)
+    if count <= EXACT_ORDER_ITEMS:
+        return min(itertools.permutations(targets),
+                   key=lambda order: sum(distances[a][b] for a, b in zip((0,) + order, order)))
+    order, current, remaining = [], 0, set(targets)
+    while remaining:
+        current = min(remaining, key=lambda target: distances[current][target])
+        order.append(current)
+        remaining.remove(current)
+    return tuple(order)
+
+class TourSeeder:
+    def __init__(self, grid_map, genome_length, rng, pool_size=32, noise=0.5):
+        self.grid_map = grid_map
+        self.genome_length = genome_length
+        self.rng = rng
+        # The first variant uses the exact terrain costs, the others perturbed ones
+        self.pool = Population([self.tour_genome(0.0 if variant == 0 else noise) for variant in range(pool_size)])
+
+    # One tour genome: items in the cheapest order, then exploration, then idling at the edge
+    def tour_genome(self, noise):
+        grid_map, rng = self.grid_map, self.rng
+        cell_costs = [cost * (1 + noise * rng.random()) for cost in grid_map.costs]
+        nodes = [grid_map.start_cell] + list(grid_map.item_cells)
+        paths = [shortest_paths(grid_map, node, cell_costs) for node in nodes]
+        distances = [[paths[a][0][b] for b in nodes] for a in range(len(nodes))]
+
+        cells, current = [], 0
+        for target in best_order(distances, len(nodes) - 1):
+            cells += path_to(paths[current][1], nodes[current], nodes[target])
+            current = target
+        actions = path_actions(grid_map, grid_map.start_cell, cells)
+        cell = nodes[current]
+        score = 100 + sum(grid_map.item_reward_list) - sum(grid_map.costs[visited] for visited in cells)
+        visited = set(cells) | {grid_map.start_cell}
+
+        # Exploration: nearest unvisited normal tile through at most MAX_DETOUR visited tiles
+        while len(actions) < self.genome_length:
+            path = self.nearest_unvisited(cell, visited)
+            if path is None or score - sum(grid_map.costs[step] for step in path) <= SCORE_MARGIN:
+                break
+            actions += path_actions(grid_map, cell, path)
+            score -= sum(grid_map.costs[step] for step in path)
+            visited.update(path)
+            cell = path[-1]
+
+        # Idling: off-grid moves are free, so the rest of the genome pushes against the nearest edge
+        distances, predecessors = shortest_paths(grid_map, cell, grid_map.costs)
+        edge = min((other for other in range(grid_map.num_cells) if -1 in grid_map.transitions[other]),
+                   key=distances.__getitem__)
+        actions += path_actions(grid_map, cell, path_to(predecessors, cell, edge))
+        actions += [grid_map.transitions[edge].index(-1)] * max(0, self.genome_length - len(actions))
+        return actions[:self.genome_length]
+
+    # Breadth-first search in random neighbour order; returns the cell path or None
+    def nearest_unvisited(self, start, visited):
+        grid_map = self.grid_map
+        depths = {start: 0}
+        parents = {}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            neighbours = [other for other in grid_map.transitions[cell] if other >= 0 and other not in depths]
+            for index in self.rng.permutation(len(neighbours)).tolist():
+                other = neighbours[index]
+                parents[other] = cell
+                depths[other] = depths[cell] + 1
+                if other not in visited and grid_map.costs[other] == 1:
+                    return path_to(parents, start, other)
+                if other in visited and depths[other] <= MAX_DETOUR:
+                    queue.append(other)
+        return None
+
+    # `count` seeded genomes: random pool variants with swap mutation
+    def genomes(self, count, mutation_rate):
+        variants = self.pool.genomes[self.rng.integers(0, len(self.pool), size=count)]
+        return batch_swap_mutation(variants, mutation_rate, self.rng)[0]
+
+# Tour seeder of the run's primary map, or None for uniformly random initialization
+def make_seeder(grid_map, config, rng):
+    if config.initialization == 'random':
+        return None
+    if config.initialization != 'heuristic':
+        raise ValueError("Invalid INITIALIZATION. Choose 'random' or 'heuristic'.")
+    return TourSeeder(grid_map, config.genome_length, rng.seeding, config.heuristic_pool_size)
+
+# Seeded share of `count` rows (initial population or immigrants)
+def seeded_count(config, count, seeder):
+    return int(config.heuristic_seed_fraction * count) if seeder is not None else 0
+
+# Initial population: uniformly random, with the seeded share replaced by mutated tours and the
+# first rows by `archived` genomes (a hall-of-fame warm start)
+def initial_population(config, rng, seeder=None, size=None, archived=None):
+    size = config.population_size if size is None else size
+    population = Population.random(size, config.genome_length, rng.initialization)
+    seeded = seeded_count(config, size, seeder)
+    if seeded:
+        population.genomes[:seeded] = seeder.genomes(seeded, config.initial_mutation_rate)
+    if archived is not None:
+        archived = archived[:size]
+        population.genomes[:len(archived)] = archived
+    return population
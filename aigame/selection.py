@@ -1,34 +1,55 @@
-import random
 import numpy as np
 
-from .constants import TOURNAMENT_SIZE_MIN, TOURNAMENT_SIZE_MAX, GENERATIONS
+from .config import DEFAULT_CONFIG
+from .rng import DEFAULT_RNG
 
-# Selection Mechanisms
+# Selection Mechanisms: both work on a Population and return the index of the selected agent.
+# Tournament sizes come from the run configuration (DEFAULT_CONFIG mirrors constants.py),
+# random draws from the run's selection stream.
 
 # Determine tournament size based on current generation (increases over generations linearly)
-def adaptive_tournament_selection(population, current_generation):
-    k = TOURNAMENT_SIZE_MIN + int(
-        (TOURNAMENT_SIZE_MAX - TOURNAMENT_SIZE_MIN) * (current_generation / GENERATIONS)
+def adaptive_tournament_size(current_generation, config=DEFAULT_CONFIG):
+    k = config.tournament_size_min + int(
+        (config.tournament_size_max - config.tournament_size_min) * (current_generation / config.generations)
     )
-    k = min(max(k, TOURNAMENT_SIZE_MIN), TOURNAMENT_SIZE_MAX)
+    return min(max(k, config.tournament_size_min), config.tournament_size_max)
 
-    candidates = random.sample(population, k)
-    winner = max(candidates, key=lambda x: x.fitness)
-    return winner
+def adaptive_tournament_selection(population, current_generation, config=DEFAULT_CONFIG, rng=DEFAULT_RNG.selection):
+    k = adaptive_tournament_size(current_generation, config)
+
+    candidates = rng.choice(len(population), size=k, replace=False)
+    winner = candidates[population.fitness[candidates].argmax()]
+    return int(winner)
 
 # Rank-based selection assigns selection probability based on rank.
 # Higher-ranked agents have higher probability of being selected.
-def rank_based_selection(population):
+def rank_based_selection(population, rng=DEFAULT_RNG.selection):
     # Sorts population by fitness in descending order
-    sorted_population = sorted(population, key=lambda x: x.fitness, reverse=True)
+    sorted_indices = population.fitness_order()
+
+    # Selects one agent based on the assigned probabilities
+    selected_index = rng.choice(sorted_indices, p=rank_probabilities(len(sorted_indices)))
+    return int(selected_index)
 
+def rank_probabilities(population_size):
     # Assigns ranks: 1 for best, 2 for second best, etc.
-    ranks = range(1, len(sorted_population) + 1)
+    ranks = np.arange(1, population_size + 1)
 
     # Assigns selection probabilities inversely proportional to rank
-    total = sum(range(1, len(sorted_population) + 1))
-    selection_probs = [(len(sorted_population) - rank + 1) / total for rank in ranks]
-
-    # Selects one agent based on the assigned probabilities
-    selected_agent = np.random.choice(sorted_population, p=selection_probs)
-    return selected_agent
\ No newline at end of file
+    total = ranks.sum()
+    return (population_size - ranks + 1) / total
+
+# Batched selection: draws num_selections parent indices at once from a fitness array
+
+# Tournaments are drawn with replacement, so all of them come from one randint call
+def batch_tournament_selection(fitness, num_selections, current_generation, config=DEFAULT_CONFIG,
+                               rng=DEFAULT_RNG.selection):
+    k = min(adaptive_tournament_size(current_generation, config), len(fitness))
+    candidates = rng.integers(0, len(fitness), size=(num_selections, k))
+    winners = fitness[candidates].argmax(axis=1)
+    return candidates[np.arange(num_selections), winners]
+
+# Sorts and computes rank probabilities once per generation instead of once per parent
+def batch_rank_based_selection(fitness, num_selections, rng=DEFAULT_RNG.selection):
+    sorted_indices = np.argsort(-fitness, kind='stable')
+    return rng.choice(sorted_indices, size=num_selections, p=rank_probabilities(len(fitness)))
@@ -0,0 +1,194 @@
+import os
+import time
+import queue
+import multiprocessing
+import numpy as np
+
+from .population import Population
+from .evaluation import _init_worker, _evaluate_chunk
+from .selection import batch_tournament_selection
+from .operators import batch_two_point_crossover, batch_swap_mutation
+from .rng import RunRNG
+from .seeding import make_seeder, initial_population
+from .fitness_bound import fitness_upper_bound, early_stop_reason
+
+# Steady-State GA: no generation barrier. A pool of evaluators continuously pulls small batches
+# of pending offspring; each result is inserted as it arrives (a child replaces the current worst
+# agent if it is at least as fit), and a new batch is bred right away so no worker sits idle.
+# Every population_size insertions count as one generation-equivalent for statistics.
+
+# Breeds a batch of children from the current population; a share of them are random immigrants
+# (or mutated tours from the heuristic `seeder`)
+def _breed(population, batch_size, generation, mutation_rate, config, rng, seeder=None):
+    parents = batch_tournament_selection(population.fitness, 2 * batch_size, generation, config, rng.selection)
+    children, _ = batch_two_point_crossover(population.genomes[parents[:batch_size]],
+                                            population.genomes[parents[batch_size:]], rng.crossover)
+    children, _ = batch_swap_mutation(children, mutation_rate, rng.mutation)
+    immigrants = rng.immigration.random(batch_size) < config.immigration_rate
+    immigrant_genomes = Population.random(int(immigrants.sum()), population.genome_length, rng.immigration).genomes
+    if seeder is not None:
+        # Batches hold only a few immigrants, so each one is seeded with probability heuristic_seed_fraction
+        seeded = rng.seeding.random(len(immigrant_genomes)) < config.heuristic_seed_fraction
+        immigrant_genomes[seeded] = seeder.genomes(int(seeded.sum()), mutation_rate)
+    children[immigrants] = immigrant_genomes
+    return children
+
+# Breeding draws from the run's RNG streams, but results are inserted in arrival order, so runs
+# with more than one worker are not bit-for-bit reproducible. Returns (final population sorted best
+# first, history, results); `archived` warm-start genomes lead the initial population. The run stops
+# early on the same bound and plateau rules as the generational loop, checked per generation-equivalent.
+def run_steady_state(grid_map, config, rng=None, archived=None):
+    rng = rng or RunRNG()
+    if config.memetic_budget:
+        raise ValueError("Memetic local search runs once per generation; use GA_MODE = 'generational' or set MEMETIC_BUDGET = 0.")
+    if config.robust_map_count > 1:
+        raise ValueError("Steady-state workers score genomes on the primary map only; use ROBUST_MAP_COUNT = 1.")
+    # Checkpoints, metrics, profiling, per-generation replays and telemetry belong to the generational loop
+    unsupported = [option for option, value in (('RUN_CHECKPOINT_DIR', config.run_checkpoint_dir),
+                                                ('METRICS_PATH', config.metrics_path),
+                                                ('PROFILE_GENERATIONS', config.profile_generations),
+                                                ('REPLAY_EXPORT_DIR', config.replay_export_dir),
+                                                ('TELEMETRY_PORT', config.telemetry_port))
+                   if value is not None]
+    if unsupported:
+        raise ValueError(f"Steady-state mode does not support {', '.join(unsupported)}; "
+                         f"use GA_MODE = 'generational' or disable {'it' if len(unsupported) == 1 else 'them'}.")
+    fitness_bound = None
+    if config.early_stop_gap is not None:
+        fitness_bound = fitness_upper_bound(grid_map, config.genome_length)[0]
+    population_size = config.population_size
+    batch_size = config.steady_state_batch
+    workers = config.evaluation_workers or os.cpu_count() or 1
+    in_flight_limit = 2 * workers  # Tasks queued per worker so the next batch is ready when one finishes
+    total_evaluations = population_size * config.generations
+    results = queue.SimpleQueue()
+
+    seeder = make_seeder(grid_map, config, rng)
+    population = initial_population(config, rng, seeder, archived=archived)
+    mutation_rate = config.initial_mutation_rate
+    best_fitness_overall = float('-inf')
+    generations_without_improvement = 0
+    history = {key: [] for key in ('best_fitness', 'avg_fitness', 'worst_fitness', 'unique_positions', 'revisits',
+                                   'elapsed')}
+    evaluations = 0
+    insertions = 0
+    accepted = 0
+    in_flight = 0
+    steps_played = 0
+    early_stop = None
+
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(grid_map,))
+    try:
+        def submit(genomes, rows=None):
+            nonlocal in_flight
+            in_flight += 1
+            pool.apply_async(_evaluate_chunk, (genomes,),
+                             callback=lambda result: results.put((genomes, rows, result)),
+                             error_callback=lambda error: results.put((None, None, error)))
+
+        # The initial population is evaluated through the same pool, batch by batch
+        for first in range(0, population_size, batch_size):
+            rows = np.arange(first, min(first + batch_size, population_size))
+            submit(population.genomes[rows], rows)
+        initialised = 0
+        generation = 0
+
+        # Records generation-equivalent statistics and steps the mutation rate schedule
+        def end_generation():
+            nonlocal generation, mutation_rate, best_fitness_overall, generations_without_improvement, early_stop
+            best = int(np.argmax(population.fitness))
+            history['best_fitness'].append(float(population.fitness[best]))
+            history['avg_fitness'].append(float(population.fitness.mean()))
+            history['worst_fitness'].append(float(population.fitness.min()))
+            history['unique_positions'].append(int(population.unique_positions[best]))
+            history['revisits'].append(int(population.revisits[best]))
+            elapsed = time.perf_counter() - start
+            history['elapsed'].append(elapsed)
+            print(f"Generation-equivalent {generation}, Best fitness: {history['best_fitness'][-1]:.2f}, "
+                  f"Average fitness: {history['avg_fitness'][-1]:.2f}, "
+                  f"Accepted children: {accepted}/{insertions}, "
+                  f"Evaluations/s: {evaluations / elapsed:.1f}")
+
+            # Same mutation rate schedule as the generational loop
+            if history['best_fitness'][-1] > best_fitness_overall:
+                best_fitness_overall = history['best_fitness'][-1]
+                generations_without_improvement = 0
+            else:
+                generations_without_improvement += 1
+            if generations_without_improvement >= config.stagnation_threshold:
+                print(f"Stagnation detected at generation-equivalent {generation}. Increasing mutation rate.")
+                mutation_rate = min(mutation_rate * 1.5, 1.0)
+                generations_without_improvement = 0
+            mutation_rate = max(config.min_mutation_rate, mutation_rate * 0.99)
+
+            # Stops once the best agent is close enough to the bound or has plateaued
+            reason = early_stop_reason(history['best_fitness'], fitness_bound, config.early_stop_gap,
+                                       config.plateau_window, config.plateau_min_improvement)
+            if reason is not None and generation + 1 < config.generations:
+                generations_saved = config.generations - generation - 1
+                early_stop = {
+                    'reason': reason,
+                    'generation': generation,
+                    'generations_saved': generations_saved,
+                    'seconds_saved': generations_saved * elapsed / len(history['elapsed']),  # Estimate at the mean pace
+                }
+                print(f"\nStopping early after generation-equivalent {generation}: {reason}. Saved "
+                      f"{generations_saved} generation-equivalents (~{early_stop['seconds_saved']:.1f}s).")
+            generation += 1
+
+        while in_flight:
+            genomes, rows, result = results.get()
+            in_flight -= 1
+            if isinstance(result, BaseException):
+                raise result
+            stats, chunk_steps = result
+            steps_played += chunk_steps
+            evaluations += len(stats)
+
+            if rows is not None:
+                population.set_stats(rows, zip(*stats))
+                initialised += len(rows)
+                if initialised == population_size:
+                    end_generation()  # The evaluated initial population is generation-equivalent 0
+            else:
+                # Replacement: each child takes the worst agent's place if it is at least as fit
+                for genome, child_stats in zip(genomes, stats):
+                    worst = int(np.argmin(population.fitness))
+                    if child_stats[0] >= population.fitness[worst]:
+                        population.genomes[worst] = genome
+                        population.set_stats(worst, child_stats)
+                        accepted += 1
+                    insertions += 1
+
+                    # Generation-equivalent: population_size insertions since the last one
+                    if insertions % population_size == 0:
+                        end_generation()
+                        if early_stop is not None:
+                            break
+            if early_stop is not None:
+                break  # Results still in flight are dropped with the pool
+
+            # Keeps every worker busy with freshly bred children until the budget is submitted
+            if initialised < population_size:
+                continue
+            while in_flight < in_flight_limit and evaluations + in_flight * batch_size < total_evaluations:
+                submit(_breed(population, batch_size, generation, mutation_rate, config, rng, seeder))
+    finally:
+        pool.terminate()
+        pool.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"\nSteady-state: {evaluations} evaluations on {workers} workers in {elapsed:.2f}s "
+          f"({evaluations / elapsed:.1f} evaluations/s, {accepted}/{insertions} children accepted)")
+    population = population.take(population.fitness_order())
+    steady_state_results = {
+        'evaluations': evaluations,
+        'accepted_children': accepted,
+        'seconds': elapsed,
+        'evaluations_per_second': evaluations / elapsed,
+        'steps_played': steps_played,
+        'fitness_bound': fitness_bound,
+        'early_stop': early_stop,
+    }
+    return population, history, steady_state_results
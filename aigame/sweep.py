@@ -0,0 +1,127 @@
+import contextlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .config import DEFAULT_CONFIG
+from .ga import genetic_algorithm
+
+# Hyperparameter Sweep: runs genetic_algorithm() for a grid (or a random sample) of configurations
+# across a process pool. Every finished run is cached as <cache_dir>/<result key>.json, so
+# re-running a sweep only computes the configurations that are new; the run's genome and plots
+# go to <cache_dir>/<result key>/.
+
+# Configurations of the sweep: the full grid over `space` ({field: [values]}), or `samples`
+# distinct points drawn from it with a seeded generator
+def sweep_configs(base_config, space, samples=None, seed=0):
+    names = list(space)
+    points = list(itertools.product(*(space[name] for name in names)))
+    if samples is not None and samples < len(points):
+        points = random.Random(seed).sample(points, samples)
+    return [base_config.replace(**dict(zip(names, point))) for point in points]
+
+# First generation whose best fitness reaches the target, and the run time when it got there
+def time_to_target(history, target):
+    if target is None:
+        return None, None
+    for generation, fitness in enumerate(history['best_fitness']):
+        if fitness >= target:
+            elapsed = history.get('elapsed')
+            return generation, elapsed[generation] if elapsed and generation < len(elapsed) else None
+    return None, None
+
+def _cache_path(cache_dir, config):
+    return os.path.join(cache_dir, config.result_key() + '.json')
+
+# Runs one configuration in a worker process and caches its summary; the run's log goes to a file
+def _run_config(config, cache_path, target):
+    os.makedirs(config.output_dir, exist_ok=True)
+    start = time.perf_counter()
+    with open(os.path.join(config.output_dir, 'run.log'), 'w') as log, contextlib.redirect_stdout(log):
+        results = genetic_algorithm(config, headless=True)
+    seconds = time.perf_counter() - start
+
+    history = results['history']
+    generations_to_target, seconds_to_target = time_to_target(history, target)
+    summary = {
+        'key': config.result_key(),
+        'config': config.to_dict(),
+        'final_best_fitness': history['best_fitness'][-1],
+        'best_fitness': max(history['best_fitness']),
+        'final_avg_fitness': history['avg_fitness'][-1],
+        'generations': len(history['best_fitness']),
+        'seconds': seconds,
+        'target': target,
+        'generations_to_target': generations_to_target,
+        'seconds_to_target': seconds_to_target,
+        'history': history,
+    }
+    temporary_path = cache_path + '.tmp'
+    with open(temporary_path, 'w') as f:
+        json.dump(summary, f)
+    os.replace(temporary_path, cache_path)  # A crashed run never leaves a partial cache entry
+    return summary
+
+# Runs the sweep and returns one summary per configuration, best first: highest final fitness,
+# ties broken by the shortest time to target
+def run_sweep(space, base_config=DEFAULT_CONFIG, samples=None, workers=None, cache_dir='sweep_cache',
+              target=None, seed=0):
+    os.makedirs(cache_dir, exist_ok=True)
+    configs = sweep_configs(base_config, space, samples, seed)
+    summaries = []
+    pending = []
+    for config in configs:
+        config = config.replace(output_dir=os.path.join(cache_dir, config.result_key()))
+        cache_path = _cache_path(cache_dir, config)
+        if os.path.exists(cache_path):
+            with open(cache_path) as f:
+                summary = json.load(f)
+            # Time to target is recomputed so cached runs can be ranked against a new target
+            summary['target'] = target
+            summary['generations_to_target'], summary['seconds_to_target'] = time_to_target(summary['history'], target)
+            summary['cached'] = True
+            summaries.append(summary)
+        else:
+            pending.append((config, cache_path))
+    print(f"Sweep: {len(configs)} configurations, {len(configs) - len(pending)} cached, {len(pending)} to run.")
+
+    # Each run is a separate process, so runs can start their own island or evaluation pools
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            futures = [executor.submit(_run_config, config, cache_path, target) for config, cache_path in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                summary = future.result()
+                summary['cached'] = False
+                summaries.append(summary)
+                print(f"[{done}/{len(pending)}] {summary['key']}: final best fitness "
+                      f"{summary['final_best_fitness']:.2f} in {summary['seconds']:.1f}s")
+
+    no_target = float('inf')
+    summaries.sort(key=lambda summary: (-summary['final_best_fitness'],
+                                        summary['seconds_to_target'] if summary['seconds_to_target'] is not None
+                                        else no_target))
+    for rank, summary in enumerate(summaries, 1):
+        summary['rank'] = rank
+    return summaries
+
+# Ranked table with one column per swept field
+def format_table(summaries, fields):
+    header = ['rank'] + list(fields) + ['final best', 'final avg', 'gens to target', 's to target', 'seconds']
+    rows = []
+    for summary in summaries:
+        to_target = summary['generations_to_target']
+        seconds_to_target = summary['seconds_to_target']
+        rows.append([str(summary['rank'])] + [str(summary['config'][field]) for field in fields] + [
+            f"{summary['final_best_fitness']:.2f}",
+            f"{summary['final_avg_fitness']:.2f}",
+            '-' if to_target is None else str(to_target),
+            '-' if seconds_to_target is None else f"{seconds_to_target:.1f}",
+            f"{summary['seconds']:.1f}" + (' (cached)' if summary.get('cached') else ''),
+        ])
+    widths = [max(len(row[column]) for row in [header] + rows) for column in range(len(header))]
+    lines = ['  '.join(cell.ljust(width) for cell, width in zip(row, widths)) for row in [header] + rows]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
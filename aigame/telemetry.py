@@ -0,0 +1,149 @@
+import json
+import queue
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from .trajectory import record_trajectory
+
+# Live Telemetry: the GA loop hands each generation's metrics and best genome to a bounded queue
+# and moves on; a background thread folds them into the served state and records the replay
+# trace whenever the best genome changes. A local HTTP server (its own daemon threads) answers:
+#   /metrics   latest generation's metrics
+#   /history   metrics of every generation so far (the last HISTORY_LIMIT)
+#   /best      best genome so far with its stats
+#   /replay    per-frame trace of the best genome: positions, score, movement cost, items
+#   /map       grid size, terrain and item positions, for drawing the replay
+# When the queue is full the oldest pending update is dropped, so a slow consumer never blocks
+# the loop; the dropped count is served with the metrics.
+
+HISTORY_LIMIT = 100000  # Generations of metrics kept for /history
+CLOSE_TIMEOUT = 10.0  # Seconds close() waits for the writer to apply the queued updates
+
+class Telemetry:
+    def __init__(self, grid_map, port=0, queue_size=64, host='127.0.0.1'):
+        self.grid_map = grid_map
+        self.updates = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.history = deque(maxlen=HISTORY_LIMIT)
+        self.best = None
+        self.replay = None
+
+        self.writer = threading.Thread(target=self._consume, name='telemetry-writer', daemon=True)
+        self.writer.start()
+        self.server = ThreadingHTTPServer((host, port), _handler(self))
+        self.server.daemon_threads = True
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name='telemetry-http', daemon=True)
+        self.server_thread.start()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    # Called from the GA loop: never blocks. `best_genome` is copied, the loop may reuse its buffer.
+    def publish(self, metrics, best_genome=None, best_stats=None):
+        self._put((metrics, None if best_genome is None else best_genome.copy(), best_stats))
+
+    # Queues an update, dropping the oldest pending one while the queue is full
+    def _put(self, update):
+        while True:
+            try:
+                self.updates.put_nowait(update)
+                return
+            except queue.Full:
+                try:
+                    self.updates.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    # Background writer: applies queued updates until the None sentinel
+    def _consume(self):
+        while True:
+            update = self.updates.get()
+            if update is None:
+                return
+            metrics, best_genome, best_stats = update
+            replay = None
+            best_changed = (best_genome is not None and
+                            (self.best is None or best_stats['fitness'] > self.best['fitness']))
+            if best_changed:
+                replay = trace(record_trajectory(self.grid_map, best_genome, best_stats['fitness']))
+            with self.lock:
+                self.metrics = dict(metrics, dropped_updates=self.dropped)
+                self.history.append(metrics)
+                if best_changed:
+                    self.best = dict(best_stats, generation=metrics.get('generation'),
+                                     genome=''.join(map(str, best_genome.tolist())))
+                    self.replay = replay
+
+    # JSON body for an endpoint (None until there is a best genome); KeyError for an unknown path
+    def snapshot(self, path):
+        if path == '/':
+            return {'endpoints': ['/metrics', '/history', '/best', '/replay', '/map']}
+        if path == '/map':
+            return map_summary(self.grid_map)
+        with self.lock:
+            if path == '/metrics':
+                return self.metrics
+            if path == '/history':
+                return list(self.history)
+            if path == '/best':
+                return self.best
+            if path == '/replay':
+                return self.replay
+        raise KeyError(path)
+
+    # Applies everything still queued, then stops the writer and the server. Never blocks on a full
+    # queue (the oldest update makes room for the sentinel) and gives up on a stuck writer after
+    # CLOSE_TIMEOUT; the writer is a daemon thread, so it does not keep the process alive.
+    def close(self, timeout=CLOSE_TIMEOUT):
+        self._put(None)
+        self.writer.join(timeout)
+        self.server.shutdown()
+        self.server.server_close()
+
+# Per-frame replay trace as plain lists
+def trace(trajectory):
+    grid_map = trajectory.grid_map
+    return {
+        'fitness': trajectory.fitness,
+        'frames': len(trajectory),
+        'positions': [grid_map.position_of(cell) for cell in trajectory.cells.tolist()],
+        'scores': trajectory.scores.tolist(),
+        'movement_costs': trajectory.movement_costs.tolist(),
+        'items_collected': trajectory.items_collected.tolist(),
+        'game_won': bool(trajectory.game_won),
+    }
+
+def map_summary(grid_map):
+    return {
+        'grid_width': grid_map.grid_width,
+        'grid_height': grid_map.grid_height,
+        'terrain': grid_map.terrain,
+        'items': [grid_map.position_of(cell) for cell in grid_map.item_cells],
+        'start': grid_map.position_of(grid_map.start_cell),
+    }
+
+def _handler(telemetry):
+    class TelemetryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            try:
+                body = telemetry.snapshot(self.path.split('?', 1)[0].rstrip('/') or '/')
+            except KeyError:
+                self.send_error(404)
+                return
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # Requests are not logged to the run's stdout
+
+    return TelemetryHandler
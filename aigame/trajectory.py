@@ -0,0 +1,124 @@
+import numpy as np
+
+from .game_simulation import GameSimulation
+
+# Trajectory: compact per-step record of one playthrough for playback and frame export.
+# Frame 0 is the start state, frame i the state after the i-th played gene. Per frame it keeps
+# the player cell, score and picked-up item slot (-1 if none); visibility and item pickups are
+# stored once as the first frame each tile was revealed / each item was picked up.
+NEVER = np.iinfo(np.int32).max
+
+class Trajectory:
+    def __init__(self, grid_map, cells, scores, pickups, movement_costs, reveal_frames, game_won, fitness=None):
+        self.grid_map = grid_map
+        self.cells = cells
+        self.scores = scores
+        self.pickups = pickups
+        self.movement_costs = movement_costs  # Cumulative movement cost per frame
+        self.reveal_frames = reveal_frames
+        self.game_won = game_won
+        self.fitness = fitness
+        self.items_collected = np.cumsum(pickups >= 0)
+        # Frame at which each item slot was picked up
+        self.pickup_frames = np.full(len(grid_map.item_cells), NEVER, dtype=np.int32)
+        picked = np.flatnonzero(pickups >= 0)
+        self.pickup_frames[pickups[picked]] = picked
+
+    def __len__(self):
+        return len(self.cells)
+
+    def visible(self, frame):
+        return self.reveal_frames <= frame
+
+    def remaining_item_cells(self, frame):
+        return [cell for slot, cell in enumerate(self.grid_map.item_cells) if self.pickup_frames[slot] > frame]
+
+    # Last frame: game over or won, otherwise the genome ran out
+    def finished(self, frame):
+        return frame == len(self) - 1 and (self.scores[frame] <= 0 or self.game_won)
+
+# Plays a genome on the map and records its trajectory
+def record_trajectory(grid_map, genome, fitness=None):
+    game = GameSimulation(grid_map=grid_map)
+    cells, scores, pickups, movement_costs = [game.player_cell], [game.score], [-1], [0]
+    reveal_frames = np.full(grid_map.num_cells, NEVER, dtype=np.int32)
+    reveal_frames[list(grid_map.neighbours[game.player_cell])] = 0
+
+    for action in np.asarray(genome).tolist():
+        if game.score <= 0 or game.game_won:
+            break
+        items_mask = game.items_mask
+        game.step(action)
+        frame = len(cells)
+        cells.append(game.player_cell)
+        scores.append(game.score)
+        movement_costs.append(game.total_movement_cost)
+        picked = items_mask & ~game.items_mask
+        pickups.append(picked.bit_length() - 1 if picked else -1)
+        neighbours = np.array(grid_map.neighbours[game.player_cell])
+        reveal_frames[neighbours] = np.minimum(reveal_frames[neighbours], frame)
+
+    return Trajectory(grid_map, np.array(cells, dtype=np.int32), np.array(scores, dtype=np.int32),
+                      np.array(pickups, dtype=np.int16), np.array(movement_costs, dtype=np.int32),
+                      reveal_frames, game.game_won, fitness)
+
+# Offline frame export: rasterizes frames straight into RGB NumPy buffers, no display needed.
+# Colours follow the Pyxel palette used by render.Game.
+PALETTE = {
+    'hidden': (0, 0, 0),
+    'normal': (0x70, 0xc6, 0xa9),
+    'mud': (0x8b, 0x48, 0x52),
+    'water': (0x76, 0x96, 0xde),
+    'item': (0xff, 0x97, 0x98),
+    'player': (0xd3, 0x84, 0x41),
+}
+
+def terrain_colours(grid_map):
+    return np.array([PALETTE[terrain] for terrain in grid_map.terrain], dtype=np.uint8)
+
+def rasterize_frame(trajectory, frame, tile_size=8, out=None, colours=None):
+    grid_map = trajectory.grid_map
+    height, width = grid_map.grid_height * tile_size, grid_map.grid_width * tile_size
+    if out is None:
+        out = np.empty((height, width, 3), dtype=np.uint8)
+    if colours is None:
+        colours = terrain_colours(grid_map)
+
+    # Tile colours, hidden tiles black, then scaled up to tile_size pixels
+    tiles = np.where(trajectory.visible(frame)[:, None], colours, np.uint8(0))
+    tiles = tiles.reshape(grid_map.grid_height, grid_map.grid_width, 3)
+    out[:] = tiles.repeat(tile_size, axis=0).repeat(tile_size, axis=1)
+
+    quarter = max(1, tile_size // 4)
+    for cell in trajectory.remaining_item_cells(frame):
+        if trajectory.reveal_frames[cell] <= frame:
+            x, y = grid_map.position_of(cell)
+            out[y * tile_size + quarter:(y + 1) * tile_size - quarter,
+                x * tile_size + quarter:(x + 1) * tile_size - quarter] = PALETTE['item']
+
+    if not trajectory.finished(frame):
+        x, y = grid_map.position_of(int(trajectory.cells[frame]))
+        out[y * tile_size:(y + 1) * tile_size, x * tile_size:(x + 1) * tile_size] = PALETTE['player']
+    return out
+
+# All frames (every `stride`-th plus the last) as one (frames, height, width, 3) buffer
+def rasterize_trajectory(trajectory, tile_size=8, stride=1):
+    frames = list(range(0, len(trajectory), stride))
+    if frames[-1] != len(trajectory) - 1:
+        frames.append(len(trajectory) - 1)
+    grid_map = trajectory.grid_map
+    buffer = np.empty((len(frames), grid_map.grid_height * tile_size, grid_map.grid_width * tile_size, 3),
+                      dtype=np.uint8)
+    colours = terrain_colours(grid_map)
+    for index, frame in enumerate(frames):
+        rasterize_frame(trajectory, frame, tile_size, out=buffer[index], colours=colours)
+    return buffer
+
+# Writes the trajectory as an animated image (GIF or any format Pillow can animate)
+def export_animation(trajectory, path, tile_size=8, stride=1, frame_duration_ms=100):
+    from PIL import Image  # Pillow is only needed for writing animations
+
+    buffer = rasterize_trajectory(trajectory, tile_size, stride)
+    images = [Image.fromarray(frame) for frame in buffer]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=frame_duration_ms, loop=0)
+    return path
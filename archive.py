@@ -0,0 +1,34 @@
+import argparse
+import os
+
+from aigame.config import GAConfig
+from aigame.hall_of_fame import HallOfFame, same_file
+
+# Hall-of-fame archive CLI, e.g.
+#   python archive.py hall_of_fame.sqlite --merge island_runs/*.sqlite   # merge archives of other runs
+#   python archive.py hall_of_fame.sqlite --top 10 --map-seed 42          # best archived genomes of a map
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge and inspect hall-of-fame genome archives.")
+    parser.add_argument('archive', help="Archive file (created if missing)")
+    parser.add_argument('--merge', nargs='+', default=[], help="Archives whose genomes are copied into this one")
+    parser.add_argument('--top', type=int, default=10, help="Entries to list")
+    parser.add_argument('--map-seed', type=int, default=GAConfig.map_seed)
+    parser.add_argument('--genome-length', type=int, help="Genome length of the listed entries (default: scaled with the default board)")
+    args = parser.parse_args(argv)
+    for path in args.merge:
+        if not os.path.exists(path):
+            parser.error(f"--merge source '{path}' does not exist")
+        if same_file(path, args.archive):
+            parser.error(f"--merge source '{path}' is the target archive '{args.archive}' itself")
+
+    with HallOfFame(args.archive) as archive:
+        for path in args.merge:
+            print(f"Merged {archive.merge(path)} new entries from '{path}'.")
+        print(f"'{args.archive}': {len(archive)} entries, {archive.genome_count()} distinct genomes.")
+        config = GAConfig(map_seed=args.map_seed, genome_length=args.genome_length)
+        for rank, (digest, fitness, evaluation) in enumerate(archive.top(config, args.top, similar=False), 1):
+            print(f"{rank:4d}  {fitness:10.2f}  {digest}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from aigame.population import Population
+from aigame.constants import FITNESS_CACHE_SIZE, CHECKPOINT_INTERVAL
+from aigame.grid_map import GridMap
+from aigame.game_simulation import GameSimulation
+from aigame.evaluation import PopulationEvaluator
+from aigame.reproduction import reproduce
+from aigame.seeding import TourSeeder
+from aigame.selection import (
+    adaptive_tournament_selection,
+    rank_based_selection,
+    batch_tournament_selection,
+    batch_rank_based_selection,
+)
+from aigame.operators import two_point_crossover, swap_mutation, batch_two_point_crossover, batch_swap_mutation
+
+# Benchmark Suite: throughput and peak memory of the hot paths over a matrix of
+# population sizes and genome lengths. Results are written as JSON and can be
+# compared against a stored baseline to flag regressions.
+
+POPULATION_SIZES = (100, 1000)
+GENOME_LENGTHS = (200, 500)
+MUTATION_RATE = 0.05
+MAX_SINGLE_CALLS = 200  # Caps per-call benchmarks (e.g. rank_based_selection) on large populations
+SEED = 42
+ROBUST_MAPS = 4  # Maps in the robust (agents x maps) evaluation case
+
+# Evaluator with the GA's default cache and checkpoint settings
+def default_evaluator(grid_map, backend):
+    return PopulationEvaluator(grid_map, backend=backend, cache_size=FITNESS_CACHE_SIZE,
+                               checkpoint_interval=CHECKPOINT_INTERVAL)
+
+# Maps case name to (run, work_items, unit); run() is timed and work_items / seconds is the throughput.
+# Uniformly random genomes die within a few dozen genes, so the cases run on swap-mutated item tours
+# (heuristic seeding) that play most of the genome, like the elites of an evolved population.
+def benchmark_cases(population_size, genome_length, grid_map, robust_maps):
+    seeder = TourSeeder(grid_map, genome_length, np.random.default_rng(SEED))
+    population = Population(seeder.genomes(population_size, MUTATION_RATE))
+    default_evaluator(grid_map, 'batch').evaluate(population)
+    population = population.take(population.fitness_order())
+    genomes = population.genomes
+    calls = min(population_size, MAX_SINGLE_CALLS)
+    game_sim = GameSimulation(grid_map=grid_map)
+
+    def simulate():
+        for agent in population:
+            game_sim.simulate(agent)
+
+    def batch_simulate():
+        PopulationEvaluator(grid_map, backend='batch').simulate(population, np.arange(population_size))
+
+    def prefix_simulate():
+        PopulationEvaluator(grid_map, backend='prefix').simulate(population, np.arange(population_size))
+
+    def robust_simulate():
+        PopulationEvaluator(grid_map, backend='batch', robust_maps=robust_maps).simulate(
+            population, np.arange(population_size)
+        )
+
+    def crossover():
+        for i in range(calls):
+            two_point_crossover(genomes[i], genomes[-1 - i])
+
+    def mutation():
+        for i in range(calls):
+            swap_mutation(genomes[i], MUTATION_RATE)
+
+    def tournament():
+        for _ in range(calls):
+            adaptive_tournament_selection(population, 0)
+
+    def rank_based():
+        for _ in range(calls):
+            rank_based_selection(population)
+
+    # Parents as the GA keeps them: evaluated with the default settings (so with their checkpoints) and sorted
+    parents = {}
+    for backend in ('serial', 'batch'):
+        parents[backend] = Population(genomes.copy())
+        default_evaluator(grid_map, backend).evaluate(parents[backend])
+        parents[backend] = parents[backend].take(parents[backend].fitness_order())
+
+    def generation(backend='serial'):
+        # One genetic_algorithm() generation: reproduce, evaluate the children, sort
+        generation_population = reproduce(parents[backend], 0, MUTATION_RATE)
+        default_evaluator(grid_map, backend).evaluate(generation_population)
+        generation_population.take(generation_population.fitness_order())
+
+    return {
+        'simulate': (simulate, population_size, 'evaluations'),
+        'simulate[batch]': (batch_simulate, population_size, 'evaluations'),
+        'simulate[prefix]': (prefix_simulate, population_size, 'evaluations'),
+        f'simulate[robust x{len(robust_maps)}]': (robust_simulate, population_size * len(robust_maps), 'evaluations'),
+        'two_point_crossover': (crossover, calls, 'children'),
+        'two_point_crossover[batch]': (lambda: batch_two_point_crossover(genomes, genomes[::-1]),
+                                       population_size, 'children'),
+        'swap_mutation': (mutation, calls, 'children'),
+        'swap_mutation[batch]': (lambda: batch_swap_mutation(genomes, MUTATION_RATE), population_size, 'children'),
+        'adaptive_tournament_selection': (tournament, calls, 'selections'),
+        'adaptive_tournament_selection[batch]': (lambda: batch_tournament_selection(population.fitness,
+                                                                                   population_size, 0),
+                                                 population_size, 'selections'),
+        'rank_based_selection': (rank_based, calls, 'selections'),
+        'rank_based_selection[batch]': (lambda: batch_rank_based_selection(population.fitness, population_size),
+                                        population_size, 'selections'),
+        'generation': (generation, 1, 'generations'),
+        'generation[batch]': (lambda: generation('batch'), 1, 'generations'),
+    }
+
+def measure(run, repeat):
+    # Best of `repeat` runs, then one traced run for peak memory
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def run_benchmarks(population_sizes=POPULATION_SIZES, genome_lengths=GENOME_LENGTHS, repeat=3, only=None):
+    grid_map = GridMap.from_seed(SEED)
+    robust_maps = [grid_map] + [GridMap.from_seed(SEED + offset) for offset in range(1, ROBUST_MAPS)]
+    results = []
+    for population_size in population_sizes:
+        for genome_length in genome_lengths:
+            cases = benchmark_cases(population_size, genome_length, grid_map, robust_maps)
+            for name, (run, work_items, unit) in cases.items():
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                seconds, peak_memory = measure(run, repeat)
+                result = {
+                    'name': name,
+                    'population_size': population_size,
+                    'genome_length': genome_length,
+                    'seconds': seconds,
+                    'unit': unit,
+                    'throughput': work_items / seconds,  # units per second
+                    'peak_memory_bytes': peak_memory,
+                }
+                if unit == 'generations':
+                    result['evaluations_per_second'] = population_size * work_items / seconds
+                results.append(result)
+                print(f"{name:40s} P={population_size:<6d} L={genome_length:<5d} "
+                      f"{result['throughput']:14.1f} {unit}/s  peak {peak_memory / 1e6:8.2f} MB")
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+# Flags cases whose throughput dropped (or peak memory grew) by more than `tolerance` against the baseline
+def compare_to_baseline(report, baseline, tolerance=0.2):
+    key = lambda result: (result['name'], result['population_size'], result['genome_length'])
+    baseline_results = {key(result): result for result in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        previous = baseline_results.get(key(result))
+        if previous is None:
+            continue
+        speed_ratio = result['throughput'] / previous['throughput']
+        memory_ratio = result['peak_memory_bytes'] / max(previous['peak_memory_bytes'], 1)
+        result['baseline_speed_ratio'] = speed_ratio
+        if speed_ratio < 1 - tolerance or memory_ratio > 1 + tolerance:
+            regressions.append((result, speed_ratio, memory_ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the simulator, operators, selection and a full generation.")
+    parser.add_argument('--population-sizes', type=int, nargs='+', default=list(POPULATION_SIZES))
+    parser.add_argument('--genome-lengths', type=int, nargs='+', default=list(GENOME_LENGTHS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', help="Only run cases whose name contains one of these strings")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Baseline results JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown before flagging")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.population_sizes, args.genome_lengths, args.repeat, args.only)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        report['regressions'] = [
+            {'name': result['name'], 'population_size': result['population_size'],
+             'genome_length': result['genome_length'], 'speed_ratio': speed_ratio, 'memory_ratio': memory_ratio}
+            for result, speed_ratio, memory_ratio in regressions
+        ]
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to '{args.output}'.")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against '{args.baseline}':")
+        for result, speed_ratio, memory_ratio in regressions:
+            print(f"  {result['name']} P={result['population_size']} L={result['genome_length']}: "
+                  f"speed x{speed_ratio:.2f}, memory x{memory_ratio:.2f}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
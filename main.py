@@ -1,7 +1,48 @@
+import argparse
+
 from aigame.ga import genetic_algorithm
+from aigame.constants import (RUN_CHECKPOINT_DIR, RUN_CHECKPOINT_EVERY, ISLAND_COUNT, MIGRATION_TOPOLOGY,
+                              REPLAY_EXPORT_DIR, GA_MODE, INITIALIZATION, ARCHIVE_PATH, WARM_START,
+                              MEMETIC_BUDGET, TELEMETRY_PORT, LOG_INTERVAL)
 
-def main():
-    genetic_algorithm()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evolve an agent for the grid game with a genetic algorithm.")
+    parser.add_argument('--headless', action='store_true',
+                        help="Write plots to files without a GUI backend and skip the Pyxel replay")
+    parser.add_argument('--checkpoint-dir', default=RUN_CHECKPOINT_DIR,
+                        help="Directory for periodic run checkpoints")
+    parser.add_argument('--checkpoint-every', type=int, default=RUN_CHECKPOINT_EVERY,
+                        help="Generations between run checkpoints")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue from the latest checkpoint in --checkpoint-dir")
+    parser.add_argument('--islands', type=int, default=ISLAND_COUNT,
+                        help="Evolve this many subpopulations in separate processes with migration (no --checkpoint-dir or --resume)")
+    parser.add_argument('--topology', choices=('ring', 'full'), default=MIGRATION_TOPOLOGY,
+                        help="Migration topology of the island model")
+    parser.add_argument('--replay-dir', default=REPLAY_EXPORT_DIR,
+                        help="Export an animated replay of every generation's best agent to this directory")
+    parser.add_argument('--mode', choices=('generational', 'steady_state'), default=GA_MODE,
+                        help="Generational loop or asynchronous steady-state GA")
+    parser.add_argument('--init', choices=('random', 'heuristic'), default=INITIALIZATION,
+                        help="Uniformly random initial population, or part of it seeded from shortest-path item tours")
+    parser.add_argument('--archive', default=ARCHIVE_PATH,
+                        help="Hall-of-fame SQLite archive the run's top agents are added to")
+    parser.add_argument('--warm-start', type=int, default=WARM_START,
+                        help="Start from this many of the best archived genomes for the map")
+    parser.add_argument('--memetic-budget', type=float, default=MEMETIC_BUDGET,
+                        help="Hill-climb the elites each generation, simulating this fraction of the genes its evaluation played")
+    parser.add_argument('--telemetry-port', type=int, default=TELEMETRY_PORT,
+                        help="Serve live metrics, the best genome and its replay trace on this local port (0: any free port; generational mode only)")
+    parser.add_argument('--log-interval', type=int, default=LOG_INTERVAL,
+                        help="Generations between printed generation lines")
+    args = parser.parse_args(argv)
+    return genetic_algorithm(headless=args.headless, resume=args.resume,
+                             run_checkpoint_dir=args.checkpoint_dir, run_checkpoint_every=args.checkpoint_every,
+                             island_count=args.islands, migration_topology=args.topology,
+                             replay_export_dir=args.replay_dir, ga_mode=args.mode,
+                             initialization=args.init, archive_path=args.archive, warm_start=args.warm_start,
+                             memetic_budget=args.memetic_budget, telemetry_port=args.telemetry_port,
+                             log_interval=args.log_interval)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
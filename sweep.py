@@ -0,0 +1,54 @@
+import argparse
+import json
+
+from aigame.config import GAConfig
+from aigame.sweep import run_sweep, format_table
+
+# Hyperparameter sweep CLI, e.g.
+#   python sweep.py --param population_size=100,200 --param initial_mutation_rate=0.05,0.1 \
+#                   --set generations=50 --target 150 --workers 4
+
+# Parses "name=v1,v2,..."; values are JSON where possible (numbers, null, true), else strings
+def parse_assignment(text):
+    name, _, values = text.partition('=')
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"Expected name=value[,value...], got '{text}'.")
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(json.loads(value))
+        except json.JSONDecodeError:
+            parsed.append(value)
+    return name, parsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a grid or random sample of GA configurations in parallel.")
+    parser.add_argument('--param', type=parse_assignment, action='append', default=[], required=True,
+                        help="Swept GAConfig field and its values, e.g. population_size=100,200 (repeatable)")
+    parser.add_argument('--set', type=parse_assignment, action='append', default=[],
+                        help="Fixed GAConfig field for every run, e.g. generations=50 (repeatable)")
+    parser.add_argument('--samples', type=int, help="Run this many random points of the grid instead of all of it")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for drawing the random sample")
+    parser.add_argument('--workers', type=int, help="Runs in parallel (default: CPU count)")
+    parser.add_argument('--cache-dir', default='sweep_cache', help="Directory of cached run results")
+    parser.add_argument('--target', type=float, help="Fitness for the generations/seconds-to-target columns")
+    parser.add_argument('--output', default='sweep_results.json')
+    args = parser.parse_args(argv)
+
+    # Sweeps are reproducible by default: every run is seeded unless --set run_seed=null is given
+    base = {'run_seed': 0}
+    base.update({name: values[0] for name, values in args.set})
+    space = dict(args.param)
+    summaries = run_sweep(space, GAConfig(**base), args.samples, args.workers, args.cache_dir, args.target, args.seed)
+
+    print()
+    print(format_table(summaries, list(space)))
+    with open(args.output, 'w') as f:
+        json.dump({'space': space, 'base': GAConfig(**base).to_dict(), 'target': args.target,
+                   'results': [{key: value for key, value in summary.items() if key != 'history'}
+                               for summary in summaries]}, f, indent=2)
+    print(f"Results saved to '{args.output}'.")
+    return summaries
+
+if __name__ == "__main__":
+    main()